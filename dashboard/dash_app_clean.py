@@ -4,15 +4,24 @@ Clean Plotly Dash version of the Lab Digital Twin Dashboard
 Fresh start to avoid callback caching issues.
 """
 
+import io
 import os
+import re
+import csv
 import json
+import codecs
 import time
+import atexit
+import functools
+import threading
 from datetime import datetime, timedelta
 
 import dash
-from dash import dcc, html, Input, Output, State, callback_context
+from dash import dcc, html, Input, Output, State, ALL, callback_context
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
+import numpy as np
 import pandas as pd
 import yaml
 from influxdb_client import InfluxDBClient
@@ -28,121 +37,290 @@ INFLUXDB_TOKEN = os.getenv("INFLUXDB_TOKEN", "dt-lab-token-2025-secure-key-for-a
 INFLUXDB_ORG = os.getenv("INFLUXDB_ORG", "lab")
 INFLUXDB_BUCKET = os.getenv("INFLUXDB_BUCKET", "measurements")
 
-# Initialize InfluxDB client
+# Timeline x-axis styling shared by all zoom levels
+_AXIS_GRID = dict(showgrid=True, gridwidth=1, gridcolor='rgba(128,128,128,0.2)')
+_TICKFONT_8 = dict(size=8)
+_TICKFONT_9 = dict(size=9)
+_TICKFONT_11 = dict(size=11)
+
+# Timeline layout settings that do not depend on the project, zoom or data
+_TIMELINE_LAYOUT = dict(
+    showlegend=False,
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='white'),
+    margin=dict(l=50, r=120, t=100, b=50),
+    # Hover by date column rather than nearest point, without spike lookups
+    hovermode='x',
+    spikedistance=0
+)
+
+# Event marker traces switch to WebGL rendering above this many points
+_WEBGL_MIN_POINTS = 5000
+
+# Centered message annotations for placeholder figures. The figures themselves
+# are built from the layout dict in one go: copying a prebuilt go.Figure
+# revalidates its whole template and is ~10x slower than constructing it.
+_ERROR_ANNOTATION = dict(
+    xref="paper", yref="paper",
+    x=0.5, y=0.5, showarrow=False,
+    font=dict(size=16, color="red")
+)
+_NO_DATA_ANNOTATION = dict(_ERROR_ANNOTATION, font=dict(size=16, color="gray"))
+_ERROR_STYLE = {'color': 'red', 'textAlign': 'center'}
+
+def error_figure(message):
+    return go.Figure(layout=dict(annotations=[dict(_ERROR_ANNOTATION, text=message)]))
+
+def no_data_figure(message):
+    return go.Figure(layout=dict(annotations=[dict(_NO_DATA_ANNOTATION, text=message)]))
+
+# Initialize InfluxDB client once and reuse its connection pool for every query
+_CLIENT = None
+
 def get_influxdb_client():
-    return InfluxDBClient(
-        url=INFLUXDB_URL,
-        token=INFLUXDB_TOKEN,
-        org=INFLUXDB_ORG
-    )
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = InfluxDBClient(
+            url=INFLUXDB_URL,
+            token=INFLUXDB_TOKEN,
+            org=INFLUXDB_ORG,
+            enable_gzip=True  # the annotated CSV responses compress well
+        )
+        atexit.register(_CLIENT.close)
+    return _CLIENT
 
-# Load swimlane configuration
+# Use libyaml's C loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Load swimlane configuration (static for the process lifetime, parsed once)
+@functools.lru_cache(maxsize=1)
 def load_swimlane_config():
     try:
         with open('/home/rms110/dt-replay-demo/config/swimlanes.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
             return sorted(config['swimlanes'], key=lambda x: x['order'])
     except FileNotFoundError:
         print("Swimlane configuration file not found")
         return []
 
-# Load projects configuration
+# Stream name -> swimlane name, inverted from the swimlane config once
+@functools.lru_cache(maxsize=1)
+def load_stream_lane_map():
+    return {stream: lane['name'] for lane in load_swimlane_config() for stream in lane['streams']}
+
+# Load projects configuration (static for the process lifetime, parsed once)
+@functools.lru_cache(maxsize=1)
 def load_projects_config():
     try:
         with open('/home/rms110/dt-replay-demo/config/projects.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
             return config['projects']
     except FileNotFoundError:
         print("Projects configuration file not found")
         return []
 
+# Timeline window per zoom level. The InfluxDB query only looks back as far as
+# the widest of these; the cached frame also feeds the counters, the events
+# table and the "Last Event Time" reference, so it is not narrowed per zoom.
+_TIME_WINDOWS = {
+    "Week": pd.Timedelta(weeks=1),
+    "Month": pd.Timedelta(days=30),
+    "Quarter": pd.Timedelta(days=90),
+    "Year": pd.Timedelta(days=365)
+}
+_QUERY_LOOKBACK_DAYS = max(window.days for window in _TIME_WINDOWS.values())
+_ONE_DAY = pd.Timedelta(days=1)
+
+# All projects' query results, split per project and shared by the
+# status/counters/timeline/events callbacks of one refresh tick. The TTL is kept
+# below the refresh interval. Callbacks run on concurrent threads, so a miss is
+# fetched under the lock and callers arriving meanwhile wait for that result.
+_DATA_CACHE = None  # (fetch time, {project_id: DataFrame})
+_DATA_LOCK = threading.Lock()
+_CACHE_TTL = 4.0  # seconds
+
+def sample_prefix(project_id):
+    """particle_id prefix of a project's samples; RM43971/WEx1 samples are named RT-XRM43971-*"""
+    return "RT-XRM43971" if project_id == "RM43971" else project_id
+
+def sample_prefixes(project_ids):
+    """Sample prefixes of the projects, longest first so a regex alternation matches the most specific one"""
+    return sorted({sample_prefix(project_id) for project_id in project_ids}, key=len, reverse=True)
+
+# Backslash-escapes RE2 metacharacters (and the '/' delimiting a Flux regex literal);
+# re.escape would also escape characters such as spaces, which RE2 rejects
+_FLUX_REGEX_ESCAPE = str.maketrans({c: "\\" + c for c in "\\.+*?()|[]{}^$/"})
+
 # Load data from InfluxDB for all projects
 def load_data(project_id=None):
+    """Return the project's events as a DataFrame (one row per pivoted record)"""
+    frame = load_all_data().get(project_id)
+    return frame if frame is not None else pd.DataFrame()
+
+def load_all_data():
+    """
+    Return {project_id: DataFrame} for every configured project, plus None for all
+    of their rows together, from a single InfluxDB query per refresh tick.
+    """
+    global _DATA_CACHE
+    cached = _DATA_CACHE
+    if cached is not None and time.time() - cached[0] < _CACHE_TTL:
+        return cached[1]
+    
+    with _DATA_LOCK:
+        cached = _DATA_CACHE
+        if cached is not None and time.time() - cached[0] < _CACHE_TTL:
+            return cached[1]
+        
+        project_ids = [project['id'] for project in load_projects_config()]
+        try:
+            df = load_data_from_influxdb(project_ids)
+        except Exception as e:
+            print(f"❌ Error loading data for projects {project_ids}: {e}")
+            return {}
+        
+        frames = split_by_project(df, project_ids)
+        _DATA_CACHE = (time.time(), frames)
+        return frames
+
+def split_by_project(df, project_ids):
+    """Slice the combined query result into one frame per project by particle_id prefix"""
+    frames = {None: df}
+    groups = {}
+    if not df.empty:
+        # Tag every row with its project in one regex pass over particle_id
+        # (longest prefix first) and group once, instead of one scan per project
+        prefixes = {sample_prefix(project_id): project_id for project_id in project_ids}
+        pattern = "^(" + "|".join(re.escape(prefix) for prefix in sample_prefixes(project_ids)) + ")"
+        row_projects = df["particle_id"].str.extract(pattern, expand=False).map(prefixes)
+        groups = dict(list(df.groupby(row_projects, sort=False)))
+    for project_id in project_ids:
+        if project_id in groups:
+            frames[project_id] = groups[project_id].reset_index(drop=True)
+        else:
+            frames[project_id] = df.iloc[:0]
+        
+        # If no data found and it's not the main project, show helpful message
+        if frames[project_id].empty and project_id != "RM43971":
+            print(f"ℹ️  No data found for {project_id}. Run 'make pub' to ingest multi-project CSV data.")
+    return frames
+
+def iter_flux_frames(response):
+    """
+    Parse a raw annotated-CSV Flux response into one DataFrame per schema block.
+    Blocks are handed to pandas' C CSV reader whole; the #datatype annotation
+    only decides which columns are timestamps, doubles or strings.
+    """
+    def parse_block(lines):
+        datatypes = next(csv.reader(lines[:1]))
+        names = next(csv.reader(lines[1:2]))
+        types = dict(zip(names, datatypes))
+        if "error" in types:
+            raise ValueError(f"Flux query error: {lines[2:3]}")
+        block = pd.read_csv(
+            io.StringIO("".join(lines[1:])),
+            usecols=names[1:],
+            dtype={name: (float if kind == "double" else str) for name, kind in types.items() if kind in ("double", "string")},
+            keep_default_na=False,
+            na_values=[""],
+            true_values=["true"],
+            false_values=["false"],
+            float_precision="round_trip",
+        )
+        for name, kind in types.items():
+            if kind.startswith("dateTime"):
+                block[name] = pd.to_datetime(block[name], utc=True, format="ISO8601")
+        return block
+    
+    lines = []
     try:
-        return load_data_from_influxdb(project_id)
-    except Exception as e:
-        print(f"❌ Error loading data for project {project_id}: {e}")
-        return []
+        for line in codecs.iterdecode(response, "utf-8"):
+            if line.strip():
+                # Only the #datatype annotation is needed; #group/#default are skipped
+                if not line.startswith("#") or line.startswith("#datatype"):
+                    lines.append(line)
+            elif len(lines) > 2:
+                yield parse_block(lines)
+                lines = []
+            else:
+                lines = []
+        if len(lines) > 2:
+            yield parse_block(lines)
+    finally:
+        response.close()
 
 # Load data from InfluxDB (original method)
-def load_data_from_influxdb(project_id=None):
+def load_data_from_influxdb(project_ids=None):
     try:
         client = get_influxdb_client()
         
-        # Temporarily disable project filtering to debug InfluxDB structure
+        # Filter to the projects' samples server-side in one query. Samples are
+        # identified by their particle_id prefix (see sample_prefix).
+        # particle_id is a field, so the filter has to follow the pivot.
         project_filter = ""
-        print(f"🔍 Debug: Loading data for project {project_id} without filtering")
+        if project_ids:
+            # Same escaped, longest-first alternation as split_by_project uses
+            prefixes = "|".join(prefix.translate(_FLUX_REGEX_ESCAPE) for prefix in sample_prefixes(project_ids))
+            project_filter = f'|> filter(fn: (r) => exists r.particle_id and r.particle_id =~ /^({prefixes})/)'
         
         query = f'''
         from(bucket: "{INFLUXDB_BUCKET}")
-          |> range(start: -365d)
+          |> range(start: -{_QUERY_LOOKBACK_DAYS}d)
           |> filter(fn: (r) => r._measurement =~ /(weights|density_volume|properties|packs|photos|events)/)
-          {project_filter}
           |> pivot(rowKey:["_time"], columnKey: ["_field"], valueColumn: "_value")
+          {project_filter}
+          |> drop(columns: ["_start", "_stop"])
         '''
         
+        # Stream the raw Flux CSV into pandas one schema block at a time (tables
+        # with different field sets come back as separate blocks), trimming each
+        # chunk before it is kept so the full raw response is never held at once
         query_api = client.query_api()
-        result = query_api.query(query=query, org=INFLUXDB_ORG)
-        
-        rows = []
-        seen_records = set()  # To deduplicate based on measurement + timestamp + entity
-        
-        for table in result:
-            for record in table.records:
-                # Create unique key for deduplication
-                sample_id = (
-                    record.values.get('particle_id') or 
-                    record.values.get('particle_id', 'N/A')
-                )
-                
-                # Debug: Show sample IDs to understand the filtering
-                if len(rows) < 3:  # Only show first few for debugging
-                    print(f"🔍 Sample ID found: '{sample_id}' for project filter: {project_id}")
-                
-                # Apply client-side filtering if project specified and server-side filter didn't work
-                if project_id:
-                    if project_id == "RM43971":
-                        # For RM43971/WEx1, only include RT-XRM43971 samples
-                        if not (sample_id and sample_id.startswith('RT-XRM43971')):
-                            continue
-                    else:
-                        # For other projects, only include samples starting with project_id
-                        if not (sample_id and sample_id.startswith(project_id)):
-                            continue
-                
-                # Use measurement + timestamp + sample_id as unique key
-                unique_key = f"{record.get_measurement()}_{record.get_time()}_{sample_id}"
-                
-                if unique_key not in seen_records:
-                    seen_records.add(unique_key)
-                    
-                    # After pivot, all fields are available as separate columns
-                    data_dict = {
-                        "particle_id": sample_id,  # Keep as particle_id for now to avoid breaking existing code
-                        **{k: v for k, v in record.values.items() 
-                           if not k.startswith('_') and k not in ['result', 'table']}
-                    }
-                    
-                    row = {
-                        "topic": f"lab/{record.get_measurement()}",
-                        "recv_ts": record.get_time().timestamp(),
-                        "stream": record.get_measurement(),
-                        "data": data_dict
-                    }
-                    rows.append(row)
+        chunks = [
+            chunk.drop(columns=["result", "table"], errors="ignore")
+            for chunk in iter_flux_frames(query_api.query_raw(query=query, org=INFLUXDB_ORG))
+            if not chunk.empty
+        ]
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
         
-        client.close()
-        print(f"📊 Loaded {len(rows)} records from InfluxDB for project {project_id}")
+        if not df.empty:
+            # After pivot, all fields are available as separate columns
+            df["recv_ts"] = (df["_time"] - pd.Timestamp(0, tz="UTC")).dt.total_seconds()
+            df["recv_time"] = df["_time"].dt.tz_convert(None)
+            # The measurement name is the stream type used by every panel
+            df["stream_type"] = df["_measurement"]
+            df["date"] = df["recv_time"].dt.floor("D")
         
-        # If no data found and it's not the main project, show helpful message
-        if len(rows) == 0 and project_id != "RM43971":
-            print(f"ℹ️  No data found for {project_id}. Run 'make pub' to ingest multi-project CSV data.")
+        print(f"📊 Loaded {len(df)} records from InfluxDB for projects {project_ids}")
         
-        return rows
+        return df
         
     except Exception as e:
         print(f"❌ Error loading data from InfluxDB: {e}")
-        return []
+        return pd.DataFrame()
+
+def data_version(df):
+    """
+    Cheap signature of a project's data: row count, newest recv_ts and today's date.
+    The date is included so "Use Current Time" windows still roll over at midnight.
+    """
+    today = datetime.now().date().isoformat()
+    if df.empty:
+        return [0, None, today]
+    return [len(df), float(df['recv_ts'].max()), today]
+
+def first_present(df, columns, default):
+    """
+    Row-wise first non-empty value among the given columns of df, or default.
+    Columns missing from df (fields no record of this query carried) are skipped.
+    """
+    result = pd.Series(default, index=df.index, dtype=object)
+    for col in reversed(columns):
+        if col in df.columns:
+            values = df[col]
+            result = values.where(values.notna() & values.ne(''), result)
+    return result
 
 
 # Initialize Dash app with different name
@@ -151,7 +329,107 @@ app = dash.Dash(__name__, title="Lab Digital Twin Dashboard Clean")
 # CSS and JavaScript will be automatically loaded from assets/ folder
 # Files are loaded in alphabetical order: config.js, dashboard.js, styles.css, utils.js
 
-# Clean layout with project tabs
+# Static tab (project info header plus its dashboard panels) for one project
+def build_project_tab(project):
+    # Use project name for tab label (professional, no icons)
+    tab_label = project['name']
+    
+    # Create tab content with project info AND full dashboard
+    tab_content = html.Div([
+        # Compact project info header
+        html.Div([
+            html.Div([
+                html.Span(f"Project Lead: {project['project_lead']}", style={'color': 'lightgray', 'marginRight': '15px', 'fontSize': '12px'}),
+                html.Span(f"Location: {project['location']}", style={'color': 'lightgray', 'marginRight': '15px', 'fontSize': '12px'}),
+                html.Span("Status: ", style={'color': 'white', 'fontSize': '12px'}),
+                html.Span(project['status'].upper(), className=f"status-{'active' if project['status'] == 'active' else 'warning'}", style={'fontSize': '12px'}),
+            ], style={'margin': '5px'}),
+            html.P(project['description'], style={'color': 'lightblue', 'fontStyle': 'italic', 'margin': '5px', 'fontSize': '11px'})
+        ], className="project-info"),
+        
+        # Full dashboard for this specific project
+        html.Div([
+            # Status indicator
+            html.Div(id=f"status-{project['id']}", style={'textAlign': 'center', 'margin': '10px'}),
+            
+            # Controls
+            html.Div([
+                html.Div([
+                    html.Label("Zoom Level:", style={'color': 'white', 'marginRight': '10px', 'display': 'block', 'marginBottom': '5px'}),
+                    dcc.Dropdown(
+                        id=f"zoom-dropdown-{project['id']}",
+                        options=[
+                            {'label': 'Week', 'value': 'Week'},
+                            {'label': 'Month', 'value': 'Month'},
+                            {'label': 'Quarter', 'value': 'Quarter'},
+                            {'label': 'Year', 'value': 'Year'}
+                        ],
+                        value='Week',
+                        className='dash-dropdown',
+                        style={'width': '150px', 'minHeight': '38px'}
+                    )
+                ], style={'display': 'inline-block', 'marginRight': '20px', 'verticalAlign': 'top'}),
+                
+                html.Div([
+                    dcc.Checklist(
+                        id=f"time-reference-{project['id']}",
+                        options=[{'label': ' Use Current Time (vs Last Event Time)', 'value': 'current'}],
+                        value=[],
+                        style={'color': 'white'}
+                    )
+                ], style={'display': 'inline-block', 'marginRight': '20px'}),
+                
+                html.Button("← Previous", id=f"prev-button-{project['id']}", n_clicks=0, className="nav-button"),
+                html.Button("Next →", id=f"next-button-{project['id']}", n_clicks=0, className="nav-button"),
+                html.Button("Jump to Latest", id=f"latest-button-{project['id']}", n_clicks=0, className="nav-button"),
+                
+            ], className="controls-panel"),
+            
+            # Event counters
+            html.Div(id=f"counters-{project['id']}", style={'margin': '20px'}),
+            
+            # Timeline graph
+            html.Div([
+                dcc.Graph(id=f"timeline-{project['id']}")
+            ], className="timeline-container"),
+            
+            # Recent events table
+            html.H3("Recent Events", className="section-title"),
+            html.Div(id=f"events-{project['id']}"),
+            
+            # Timeline offset store for this project
+            dcc.Store(id=f"timeline-offset-{project['id']}", data=0),
+            
+            # Shared data store: only changes when new rows arrive
+            dcc.Store(id={'type': 'project-data', 'id': project['id']})
+        ])
+    ])
+    
+    tab = dcc.Tab(
+        label=tab_label,
+        value=project['id'],
+        children=tab_content,
+        style={
+            'backgroundColor': '#2d3748', 
+            'color': 'white', 
+            'border': '1px solid #4ECDC4',
+            'fontSize': '12px',
+            'padding': '8px 12px',
+            'fontFamily': 'Arial, sans-serif'
+        },
+        selected_style={
+            'backgroundColor': '#4ECDC4', 
+            'color': 'black', 
+            'fontWeight': 'bold',
+            'fontSize': '12px'
+        }
+    )
+    
+    return tab
+
+# Clean layout with project tabs, built once at import (the config is static)
+_PROJECTS = load_projects_config()
+
 app.layout = html.Div([
     # Header section with improved styling
     html.Div([
@@ -163,8 +441,8 @@ app.layout = html.Div([
     html.Div([
         dcc.Tabs(
             id="project-tabs",
-            value=None,
-            children=[],  # Will be populated by callback
+            value=_PROJECTS[0]['id'] if _PROJECTS else None,  # Default to first project
+            children=[build_project_tab(project) for project in _PROJECTS],
             className="tab-content",
             parent_className="tab-parent",
             colors={
@@ -184,121 +462,6 @@ app.layout = html.Div([
     
 ], id="app-container")
 
-# Project tabs population callback (only run once on startup)
-@app.callback(
-    Output('project-tabs', 'children'),
-    Output('project-tabs', 'value'),
-    Input('refresh', 'n_intervals'),
-    prevent_initial_call=False
-)
-def update_project_tabs(n):
-    # Only run on first load (n_intervals = 0) to avoid resetting tabs
-    if n > 0:
-        return dash.no_update, dash.no_update
-        
-    projects = load_projects_config()
-    if not projects:
-        return [], None
-    
-    tabs = []
-    for project in projects:
-        # Use project name for tab label (professional, no icons)
-        tab_label = project['name']
-        
-        # Create tab content with project info AND full dashboard
-        tab_content = html.Div([
-            # Compact project info header
-            html.Div([
-                html.Div([
-                    html.Span(f"Project Lead: {project['project_lead']}", style={'color': 'lightgray', 'marginRight': '15px', 'fontSize': '12px'}),
-                    html.Span(f"Location: {project['location']}", style={'color': 'lightgray', 'marginRight': '15px', 'fontSize': '12px'}),
-                    html.Span("Status: ", style={'color': 'white', 'fontSize': '12px'}),
-                    html.Span(project['status'].upper(), className=f"status-{'active' if project['status'] == 'active' else 'warning'}", style={'fontSize': '12px'}),
-                ], style={'margin': '5px'}),
-                html.P(project['description'], style={'color': 'lightblue', 'fontStyle': 'italic', 'margin': '5px', 'fontSize': '11px'})
-            ], className="project-info"),
-            
-            # Full dashboard for this specific project
-            html.Div([
-                # Status indicator
-                html.Div(id=f"status-{project['id']}", style={'textAlign': 'center', 'margin': '10px'}),
-                
-                # Controls
-                html.Div([
-                    html.Div([
-                        html.Label("Zoom Level:", style={'color': 'white', 'marginRight': '10px', 'display': 'block', 'marginBottom': '5px'}),
-                        dcc.Dropdown(
-                            id=f"zoom-dropdown-{project['id']}",
-                            options=[
-                                {'label': 'Week', 'value': 'Week'},
-                                {'label': 'Month', 'value': 'Month'},
-                                {'label': 'Quarter', 'value': 'Quarter'},
-                                {'label': 'Year', 'value': 'Year'}
-                            ],
-                            value='Week',
-                            className='dash-dropdown',
-                            style={'width': '150px', 'minHeight': '38px'}
-                        )
-                    ], style={'display': 'inline-block', 'marginRight': '20px', 'verticalAlign': 'top'}),
-                    
-                    html.Div([
-                        dcc.Checklist(
-                            id=f"time-reference-{project['id']}",
-                            options=[{'label': ' Use Current Time (vs Last Event Time)', 'value': 'current'}],
-                            value=[],
-                            style={'color': 'white'}
-                        )
-                    ], style={'display': 'inline-block', 'marginRight': '20px'}),
-                    
-                    html.Button("← Previous", id=f"prev-button-{project['id']}", n_clicks=0, className="nav-button"),
-                    html.Button("Next →", id=f"next-button-{project['id']}", n_clicks=0, className="nav-button"),
-                    html.Button("Jump to Latest", id=f"latest-button-{project['id']}", n_clicks=0, className="nav-button"),
-                    
-                ], className="controls-panel"),
-                
-                # Event counters
-                html.Div(id=f"counters-{project['id']}", style={'margin': '20px'}),
-                
-                # Timeline graph
-                html.Div([
-                    dcc.Graph(id=f"timeline-{project['id']}")
-                ], className="timeline-container"),
-                
-                # Recent events table
-                html.H3("Recent Events", className="section-title"),
-                html.Div(id=f"events-{project['id']}"),
-                
-                # Timeline offset store for this project
-                dcc.Store(id=f"timeline-offset-{project['id']}", data=0)
-            ])
-        ])
-        
-        tab = dcc.Tab(
-            label=tab_label,
-            value=project['id'],
-            children=tab_content,
-            style={
-                'backgroundColor': '#2d3748', 
-                'color': 'white', 
-                'border': '1px solid #4ECDC4',
-                'fontSize': '12px',
-                'padding': '8px 12px',
-                'fontFamily': 'Arial, sans-serif'
-            },
-            selected_style={
-                'backgroundColor': '#4ECDC4', 
-                'color': 'black', 
-                'fontWeight': 'bold',
-                'fontSize': '12px'
-            }
-        )
-        tabs.append(tab)
-    
-    # Default to first project
-    default_project = projects[0]['id'] if projects else None
-    
-    return tabs, default_project
-
 # Store selected project - removed since each tab has its own components now
         
 # This broken callback has been removed - each project now has its own status callback
@@ -309,9 +472,42 @@ def update_project_tabs(n):
 
 # This broken callback has been removed - each project now has its own timeline callback
 
+# Shared data fetch: one pattern-matching callback polls the shared loader for
+# every project once per tick; the per-project callbacks below fire when that
+# project's version changes
+@app.callback(
+    Output({'type': 'project-data', 'id': ALL}, 'data'),
+    Input('refresh', 'n_intervals'),
+    State({'type': 'project-data', 'id': ALL}, 'data'),
+    prevent_initial_call=True
+)
+def update_project_data(n, current_versions):
+    pids = [output['id']['id'] for output in callback_context.outputs_list]
+    frames = map(load_data, pids)
+    return [
+        dash.no_update if version == current else version
+        for version, current in zip(map(data_version, frames), current_versions)
+    ]
+
+# Built timeline figures keyed on project, view settings and data version, so
+# switching back to a recent view is a lookup. Oldest entries are evicted first.
+# Figures are stored as already-encoded JSON dicts: re-serialising the plain dict
+# on each return is far cheaper than encoding the go.Figure and its timestamps.
+# Callbacks run on concurrent threads, so lookups, inserts and evictions hold the
+# lock; figures are built outside it.
+_FIG_CACHE = {}
+_FIG_CACHE_MAX = 128
+_FIG_CACHE_LOCK = threading.Lock()
+
 # Create dynamic callbacks for each project
+_CALLBACKS_REGISTERED = False
+
 def create_project_callbacks():
-    """Create callbacks dynamically for each project"""
+    """Create callbacks dynamically for each project (once; Dash rejects duplicate outputs)"""
+    global _CALLBACKS_REGISTERED
+    if _CALLBACKS_REGISTERED:
+        return
+    _CALLBACKS_REGISTERED = True
     projects = load_projects_config()
     
     for project in projects:
@@ -321,12 +517,17 @@ def create_project_callbacks():
         @app.callback(
             Output(f'status-{project_id}', 'children'),
             Input('refresh', 'n_intervals'),
+            Input('project-tabs', 'value'),
             prevent_initial_call=True
         )
-        def update_status(n, pid=project_id):
+        def update_status(n, active_tab, pid=project_id):
+            # Hidden tabs are skipped; selecting the tab re-triggers this callback
+            if active_tab != pid:
+                return dash.no_update
             try:
-                rows = load_data(pid)
-                recent_count = len([r for r in rows if r['recv_ts'] > (pd.Timestamp.now().timestamp() - 120)])
+                df = load_data(pid)
+                cutoff = time.time() - 120
+                recent_count = int((df['recv_ts'] > cutoff).sum()) if not df.empty else 0
                 
                 if recent_count > 0:
                     return html.Div(f"📡 Project {pid} active ({recent_count} recent events)", 
@@ -341,34 +542,28 @@ def create_project_callbacks():
         # Counters callback for each project
         @app.callback(
             Output(f'counters-{project_id}', 'children'),
-            Input('refresh', 'n_intervals'),
+            Input({'type': 'project-data', 'id': project_id}, 'data'),
+            Input('project-tabs', 'value'),
             prevent_initial_call=True
         )
-        def update_counters(n, pid=project_id):
+        def update_counters(n, active_tab, pid=project_id):
+            if active_tab != pid:
+                return dash.no_update
             try:
-                rows = load_data(pid)
-                if not rows:
+                df = load_data(pid)
+                if df.empty:
                     if pid == "RM43971":
                         return html.P("No data available", style={'color': 'gray', 'textAlign': 'center'})
                     else:
                         return html.P(f"No data for {pid}. Run 'make pub' to ingest multi-project data.", 
                                     style={'color': 'gray', 'textAlign': 'center'})
                 
-                df = pd.DataFrame(rows)
-                if not df.empty:
-                    if "topic" in df.columns:
-                        df["stream_type"] = df["topic"].str.replace("lab/", "")
-                    elif "stream" in df.columns:
-                        df["stream_type"] = df["stream"]
-                    else:
-                        df["stream_type"] = "unknown"
-                
-                stream_counts = df["stream_type"].value_counts().to_dict()
+                lane_counts = df["stream_type"].map(load_stream_lane_map()).value_counts().to_dict()
                 swimlanes_config = load_swimlane_config()
                 counter_divs = []
                 
                 for swimlane in swimlanes_config:
-                    swimlane_count = sum(stream_counts.get(stream, 0) for stream in swimlane['streams'])
+                    swimlane_count = lane_counts.get(swimlane['name'], 0)
                     
                     counter_div = html.Div([
                         html.H4(swimlane['name'], className="counter-title"),
@@ -397,102 +592,103 @@ def create_project_callbacks():
                 
             except Exception as e:
                 return html.P(f"Error loading counters for {pid}: {str(e)}", 
-                            style={'color': 'red', 'textAlign': 'center'})
+                            style=_ERROR_STYLE)
         
         # Timeline callback for each project
         @app.callback(
             Output(f'timeline-{project_id}', 'figure'),
-            [Input('refresh', 'n_intervals'),
+            [Input({'type': 'project-data', 'id': project_id}, 'data'),
              Input(f'zoom-dropdown-{project_id}', 'value'),
              Input(f'timeline-offset-{project_id}', 'data'),
-             Input(f'time-reference-{project_id}', 'value')],
+             Input(f'time-reference-{project_id}', 'value'),
+             Input('project-tabs', 'value')],
             prevent_initial_call=True
         )
-        def update_timeline(n, zoom_level, timeline_offset, time_reference, pid=project_id):
+        def update_timeline(n, zoom_level, timeline_offset, time_reference, active_tab, pid=project_id):
+            if active_tab != pid:
+                return dash.no_update
             try:
                 zoom_level = zoom_level or 'Week'
                 timeline_offset = timeline_offset or 0
                 use_current_time = 'current' in (time_reference or [])
                 
-                rows = load_data(pid)
-                if not rows:
+                df = load_data(pid)
+                if df.empty:
                     if pid == "RM43971":
                         message = "Waiting for events..."
                     else:
                         message = f"No data for {pid}. Run 'make pub' to ingest multi-project data."
                     
-                    return go.Figure().add_annotation(
-                        text=message, 
-                        xref="paper", yref="paper", 
-                        x=0.5, y=0.5, showarrow=False,
-                        font=dict(size=16, color="gray")
-                    )
+                    return no_data_figure(message)
                 
-                # Use the existing timeline creation logic but with project-specific data
-                return update_timeline_internal(rows, zoom_level, timeline_offset, use_current_time, pid)
+                # Reuse a built figure if neither the view nor the data changed
+                key = (pid, zoom_level, timeline_offset, use_current_time, tuple(data_version(df)))
+                with _FIG_CACHE_LOCK:
+                    fig = _FIG_CACHE.get(key)
+                if fig is None:
+                    # Use the existing timeline creation logic but with project-specific data
+                    fig = json.loads(pio.to_json(update_timeline_internal(df, zoom_level, timeline_offset, use_current_time, pid), validate=False))
+                    with _FIG_CACHE_LOCK:
+                        _FIG_CACHE[key] = fig
+                        if len(_FIG_CACHE) > _FIG_CACHE_MAX:
+                            _FIG_CACHE.pop(next(iter(_FIG_CACHE)), None)
+                return fig
                 
             except Exception as e:
-                return go.Figure().add_annotation(
-                    text=f"Error for {pid}: {str(e)}", 
-                    xref="paper", yref="paper", 
-                    x=0.5, y=0.5, showarrow=False,
-                    font=dict(size=16, color="red")
-                )
+                print(f"❌ Error in timeline graph for {pid}: {e}")
+                return error_figure(f"Error for {pid}: {str(e)}")
         
         # Events callback for each project
         @app.callback(
             Output(f'events-{project_id}', 'children'),
-            Input('refresh', 'n_intervals'),
+            Input({'type': 'project-data', 'id': project_id}, 'data'),
+            Input('project-tabs', 'value'),
             prevent_initial_call=True
         )
-        def update_events(n, pid=project_id):
+        def update_events(n, active_tab, pid=project_id):
+            if active_tab != pid:
+                return dash.no_update
             try:
-                rows = load_data(pid)
-                if not rows:
+                df = load_data(pid)
+                if df.empty:
                     if pid == "RM43971":
                         return html.P("No recent events", style={'color': 'gray', 'textAlign': 'center'})
                     else:
                         return html.P(f"No events for {pid}. Run 'make pub' to ingest multi-project data.", 
                                     style={'color': 'gray', 'textAlign': 'center'})
                 
-                df = pd.DataFrame(rows)
-                df["recv_time"] = pd.to_datetime(df["recv_ts"], unit="s")
-                if not df.empty:
-                    if "topic" in df.columns:
-                        df["stream_type"] = df["topic"].str.replace("lab/", "")
-                    elif "stream" in df.columns:
-                        df["stream_type"] = df["stream"]
-                    else:
-                        df["stream_type"] = "unknown"
+                recent_df = df.nlargest(20, "recv_ts")
+                # Only the displayed rows need converting and formatting
+                recv_time_strs = recent_df["recv_time"].dt.strftime("%Y-%m-%d %H:%M:%S")
+                
+                # Build the content column for all rows at once
+                is_event = recent_df["stream_type"].eq("events").to_numpy()
+                
+                # Events: with pivoted data, text should be directly available
+                event_texts = first_present(recent_df, ['text', 'value'], 'Event').astype(str)
+                
+                # Measurements: show particle_id and value
+                particle_ids = first_present(recent_df, ['particle_id'], 'N/A').astype(str)
+                values = first_present(recent_df, ['value'], None)
+                # Rows without a value field carry NaN here (falsy values are skipped as well)
+                has_value = values.notna() & values.map(bool)
+                measurement_texts = particle_ids.copy()
+                measurement_texts[has_value] = particle_ids[has_value] + " (value: " + values[has_value].astype(str) + ")"
+                
+                contents = pd.Series(np.where(is_event, event_texts, measurement_texts), index=recent_df.index)
+                
+                # Truncate long content
+                contents = contents.where(contents.str.len() <= 50, contents.str.slice(0, 50) + '...')
                 
-                recent_df = df.sort_values("recv_ts", ascending=False).head(20)
+                event_style = {'color': '#FFA500', 'padding': '5px'}  # Orange for events
+                measurement_style = {'color': 'lightgray', 'padding': '5px'}
                 
                 table_data = []
-                for _, row in recent_df.iterrows():
-                    data_dict = row.get("data", {})
-                    
-                    # Show relevant content based on stream type
-                    if row["stream_type"] == "events":
-                        # With pivoted data, text should be directly available
-                        content = data_dict.get('text', data_dict.get('value', 'Event'))
-                        content_style = {'color': '#FFA500', 'padding': '5px'}  # Orange for events
-                    else:
-                        # For measurements, show particle_id and value
-                        particle_id = data_dict.get("particle_id", "N/A")
-                        value = data_dict.get("_value", data_dict.get("value", ""))
-                        if value:
-                            content = f"{particle_id} (value: {value})"
-                        else:
-                            content = particle_id
-                        content_style = {'color': 'lightgray', 'padding': '5px'}
-                    
-                    # Truncate long content
-                    content = str(content)[:50] + ('...' if len(str(content)) > 50 else '')
-                    
+                for recv_time_str, stream_type, content, row_is_event in zip(recv_time_strs, recent_df["stream_type"], contents, is_event):
                     table_data.append(html.Tr([
-                        html.Td(row["recv_time"].strftime("%Y-%m-%d %H:%M:%S"), style={'color': 'white', 'padding': '5px'}),
-                        html.Td(row["stream_type"], style={'color': 'lightblue', 'padding': '5px'}),
-                        html.Td(content, style=content_style)
+                        html.Td(recv_time_str, style={'color': 'white', 'padding': '5px'}),
+                        html.Td(stream_type, style={'color': 'lightblue', 'padding': '5px'}),
+                        html.Td(content, style=event_style if row_is_event else measurement_style)
                     ]))
                 
                 return html.Table([
@@ -508,7 +704,7 @@ def create_project_callbacks():
                 
             except Exception as e:
                 return html.P(f"Error loading events for {pid}: {str(e)}", 
-                            style={'color': 'red', 'textAlign': 'center'})
+                            style=_ERROR_STYLE)
         
         # Timeline offset callback for navigation
         @app.callback(
@@ -536,9 +732,10 @@ def create_project_callbacks():
             return current_offset or 0
 
 # Helper function to get public holidays for a given year
+@functools.lru_cache(maxsize=8)
 def get_public_holidays(year):
     """
-    Returns a set of public holiday dates for the given year.
+    Returns a frozenset of public holiday dates for the given year.
     Currently configured for Australian public holidays.
     You can customize this based on your location.
     """
@@ -557,7 +754,6 @@ def get_public_holidays(year):
     try:
         # Simple Easter calculation (approximate)
         # For more accuracy, you could use a library like `holidays`
-        import calendar
         
         # Queen's Birthday (second Monday in June in most Australian states)
         june_first = date(year, 6, 1)
@@ -573,11 +769,32 @@ def get_public_holidays(year):
         labour_day = date(year, 3, 1 + days_to_first_monday)
         holidays.add(labour_day)
         
-    except:
+    except ValueError:
         # If calculation fails, just skip the calculated holidays
         pass
     
-    return holidays
+    return frozenset(holidays)
+
+def _monthly_ticks(date_index, max_ticks):
+    """
+    Return (tick_dates, tick_texts) for the first date of each month in the sorted
+    date_index, keeping every n-th month so that at most max_ticks ticks are shown.
+    """
+    month_dates = date_index[~date_index.to_period('M').duplicated()]
+    stride = max(1, -(-len(month_dates) // max_ticks))
+    month_dates = month_dates[::stride]
+    return month_dates, month_dates.strftime('%b %Y').tolist()
+
+@functools.lru_cache(maxsize=4)
+def _swimlane_layout(lane_count):
+    """Axis grid (and default template) of the stacked swimlane subplots as a plain layout dict"""
+    return make_subplots(
+        rows=lane_count, 
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.02,
+        subplot_titles=None
+    ).to_dict()['layout']
 
 def position_events_without_overlap(events_data, zoom_level):
     """
@@ -679,15 +896,14 @@ def position_events_without_overlap(events_data, zoom_level):
             'arrow_x': arrow_x,
             'arrow_y': arrow_y,
             'angle': angle,
-            'font_size': current_config['font_size'],
-            'data': event['data']
+            'font_size': current_config['font_size']
         }
         
         positioned_events.append(positioned_event)
         position_tracker.append((event_time, y_level, event_end_time))
         
         # Clean up old entries to prevent excessive memory usage
-        cutoff_time = event_time - pd.Timedelta(hours=24)
+        cutoff_time = event_time - _ONE_DAY
         position_tracker = [
             (t, l, e) for t, l, e in position_tracker if e > cutoff_time
         ]
@@ -695,484 +911,365 @@ def position_events_without_overlap(events_data, zoom_level):
     return positioned_events
 
 # Internal timeline function (extracted from callback to reuse logic)
-def update_timeline_internal(rows, zoom_level, timeline_offset, use_current_time, project_id):
+def update_timeline_internal(df, zoom_level, timeline_offset, use_current_time, project_id):
     """Create timeline figure for a specific project using existing logic"""
+    if df.empty:
+        return no_data_figure(f"Waiting for events for project {project_id}...")
+    
+    
+    # Load swimlanes configuration (include all swimlanes now, already in order)
+    measurement_swimlanes = load_swimlane_config()
+    
+    if not measurement_swimlanes:
+        return error_figure("No swimlane configuration found")
+    
+    # Calculate time window based on zoom level and offset
+    window_duration = _TIME_WINDOWS[zoom_level]
+    
+    # Choose reference time based on checkbox
+    if use_current_time:
+        reference_time = pd.Timestamp.now()
+        time_label = "Current Time"
+    else:
+        reference_time = df['recv_time'].max()
+        time_label = "Last Event Time"
+    
+    # Apply offset (0 = most recent period, 1 = previous period, etc.)
+    window_end = reference_time - (timeline_offset * window_duration)
+    window_start = window_end - window_duration
+    
+    # Filter data to time window
+    window_df = df[(df['recv_time'] >= window_start) & (df['recv_time'] <= window_end)]
+    
+    # Nothing to draw in this window - skip the swimlane/tick pipeline entirely
+    if window_df.empty:
+        return no_data_figure(
+            f"No events for project {project_id} between {window_start.strftime('%b %d')} and {window_end.strftime('%b %d, %Y')}"
+        )
+    
+    lane_count = len(measurement_swimlanes)
+    
+    # Window days as midnight timestamps, kept as datetime64 for all swimlanes
+    date_index = pd.date_range(start=window_start.normalize(), end=window_end.normalize(), freq='D')
+    
+    # Calculate daily event counts per swimlane in one groupby (date x swimlane),
+    # keyed on the day column the loader already derived
+    lane_daily_counts = (
+        window_df.groupby(['date', window_df['stream_type'].map(load_stream_lane_map()).rename('swimlane')])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(index=date_index, columns=[lane['name'] for lane in measurement_swimlanes], fill_value=0)
+    )
+    
+    # Create subplot layout with error handling. The figure is assembled as a
+    # plain dict on a copy of the cached axis grid: graph_objects would validate
+    # every trace, axis and layout update only for it to be serialised again
     try:
-        if not rows:
-            return go.Figure().add_annotation(
-                text=f"Waiting for events for project {project_id}...", 
-                xref="paper", yref="paper", 
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=20, color="gray")
-            )
-        
-        df = pd.DataFrame(rows)
-        df["recv_time"] = pd.to_datetime(df["recv_ts"], unit="s")
-        if not df.empty:
-            if "topic" in df.columns:
-                df["stream_type"] = df["topic"].str.replace("lab/", "")
-            elif "stream" in df.columns:
-                df["stream_type"] = df["stream"]
-            else:
-                df["stream_type"] = "unknown"
-        
-        # Load swimlanes configuration (include all swimlanes now)
-        swimlanes = load_swimlane_config()
-        measurement_swimlanes = sorted(swimlanes, key=lambda x: x['order'])
-        
-        if not measurement_swimlanes:
-            return go.Figure().add_annotation(
-                text="No swimlane configuration found", 
-                xref="paper", yref="paper", 
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=20, color="red")
-            )
-        
-        # Calculate time window based on zoom level and offset
-        time_windows = {
-            "Week": pd.Timedelta(weeks=1),
-            "Month": pd.Timedelta(days=30), 
-            "Quarter": pd.Timedelta(days=90),
-            "Year": pd.Timedelta(days=365)
-        }
-        
-        window_duration = time_windows[zoom_level]
-        
-        # Choose reference time based on checkbox
-        if use_current_time:
-            reference_time = pd.Timestamp.now()
-            time_label = "Current Time"
-        else:
-            reference_time = df['recv_time'].max() if not df.empty else pd.Timestamp.now()
-            time_label = "Last Event Time"
-        
-        # Apply offset (0 = most recent period, 1 = previous period, etc.)
-        window_end = reference_time - (timeline_offset * window_duration)
-        window_start = window_end - window_duration
-        
-        # Filter data to time window
-        window_df = df[(df['recv_time'] >= window_start) & (df['recv_time'] <= window_end)].copy()
-        
-        # Create date range
-        window_start_date = window_start.date()
-        window_end_date = window_end.date()
-        all_dates = pd.date_range(start=window_start_date, end=window_end_date, freq='D')
-        all_dates = [d.date() for d in all_dates]
-        
-        if not all_dates:
-            all_dates = [window_end_date]
-        
-        # Calculate daily event counts
-        if not window_df.empty:
-            window_df['date'] = pd.to_datetime(window_df['recv_time']).dt.date
-            daily_counts = window_df.groupby(['date', 'stream_type']).size().reset_index(name='count')
-        else:
-            daily_counts = pd.DataFrame(columns=['date', 'stream_type', 'count'])
-        
-        # Create subplot figure with error handling
-        try:
-            fig = make_subplots(
-                rows=len(measurement_swimlanes), 
-                cols=1,
-                shared_xaxes=True,
-                vertical_spacing=0.02,
-                subplot_titles=None
-            )
-        except Exception as e:
-            return go.Figure().add_annotation(
-                text=f"Error creating timeline layout: {str(e)}", 
-                xref="paper", yref="paper", 
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16, color="red")
-            )
+        base_layout = _swimlane_layout(lane_count)
+    except ValueError as e:
+        return error_figure(f"Error creating timeline layout: {str(e)}")
+    layout = {key: dict(value) if key.startswith(('xaxis', 'yaxis')) else value for key, value in base_layout.items()}
+    traces = []
+    
+    # Shapes and annotations are collected as plain dicts and assigned to the
+    # layout once: add_shape/add_annotation revalidate the whole list per call
+    shapes = []
+    annotations = []
+    
+    # Bars sit at midday
+    dates = date_index + pd.Timedelta(hours=12)
+    
+    # Weekend days of the window, classified once for all swimlanes and merged
+    # into one shaded block per Saturday-Sunday run (half the layout shapes)
+    weekend_days = date_index[date_index.dayofweek >= 5]  # Saturday (5) or Sunday (6)
+    weekend_np = weekend_days.to_numpy()
+    one_day = np.timedelta64(1, 'D')
+    weekend_starts = weekend_days[np.diff(weekend_np, prepend=np.datetime64('NaT')) != one_day]
+    weekend_ends = weekend_days[np.diff(weekend_np, append=np.datetime64('NaT')) != one_day] + _ONE_DAY
+    
+    # Public holidays (Australian) for every year the window touches
+    public_holidays = frozenset().union(*(get_public_holidays(year) for year in set(date_index.year)))
+    holiday_starts = date_index[date_index.isin(pd.DatetimeIndex(sorted(public_holidays)))]
+    holiday_ends = holiday_starts + _ONE_DAY
+    
+    # Add bars/annotations for each swimlane with events handling
+    for i, swimlane in enumerate(measurement_swimlanes, 1):
+        # Axis references of this lane's subplot (the first one is unnumbered)
+        suffix = str(i) if i > 1 else ""
+        xref, yref = f"x{suffix}", f"y{suffix}"
         
-        # Add bars/annotations for each swimlane with events handling
-        for i, swimlane in enumerate(measurement_swimlanes, 1):
-            # Handle Messages swimlane differently - show text messages with smart positioning
-            if swimlane['name'] == 'Messages':
-                # Get actual event data for this swimlane
-                events_data = []
-                for stream_type in swimlane['streams']:
-                    stream_events = window_df[window_df['stream_type'] == stream_type]
-                    
-                    print(f"🔍 Total {stream_type} records: {len(stream_events)}")
-                    
-                    # With pivoted data, all event fields should be available directly
-                    for _, row in stream_events.iterrows():
-                        data_dict = row.get('data', {})
-                        
-                        # Extract event text from various possible fields
-                        event_text = (
-                            data_dict.get('text') or 
-                            data_dict.get('value') or
-                            data_dict.get('message') or
-                            data_dict.get('description') or
-                            str(list(data_dict.items())[:2]) if data_dict else
-                            'Event'
-                        )
-                        
-                        severity = data_dict.get('severity', 'info')
-                        event_time = row['recv_time']
-                        
-                        print(f"🔍 Event found - text: '{event_text}', severity: '{severity}' at {event_time}")
-                        
-                        events_data.append({
-                            'time': event_time,
-                            'text': event_text,
-                            'severity': severity,
-                            'data': data_dict
-                        })
+        # Handle Messages swimlane differently - show text messages with smart positioning
+        if swimlane['name'] == 'Messages':
+            # Get actual event data for this swimlane
+            events_data = []
+            for stream_type in swimlane['streams']:
+                stream_events = window_df[window_df['stream_type'] == stream_type]
                 
-                # Sort events by time for better positioning
-                events_data.sort(key=lambda x: x['time'])
+                print(f"🔍 Total {stream_type} records: {len(stream_events)}")
                 
-                # Add a minimal bar to establish the timeline
-                dates = [pd.Timestamp(date) + pd.Timedelta(hours=12) for date in all_dates]
-                empty_counts = [0] * len(all_dates)
+                # With pivoted data, all event fields are available as columns;
+                # take the event text from the first populated text-like field
+                event_texts = first_present(stream_events, ['text', 'value', 'message', 'description'], 'Event')
+                severities = first_present(stream_events, ['severity'], 'info')
                 
-                fig.add_trace(
-                    go.Bar(
-                        x=dates,
-                        y=empty_counts,
-                        name=swimlane['name'],
-                        marker_color='rgba(0,0,0,0)',  # Invisible bars
-                        showlegend=False,
-                        hoverinfo='skip'
-                    ),
-                    row=i, col=1
-                )
-                
-                # Show text for Week/Month views, markers for Quarter/Year views
-                if zoom_level in ['Week', 'Month'] and events_data:
-                    # Smart positioning to prevent overlap
-                    positioned_events = position_events_without_overlap(events_data, zoom_level)
+                for event_time, event_text, severity in zip(stream_events['recv_time'], event_texts, severities):
+                    print(f"🔍 Event found - text: '{event_text}', severity: '{severity}' at {event_time}")
                     
-                    for event in positioned_events:
-                        # Color based on severity
-                        severity_colors = {
-                            'info': swimlane['color'],
-                            'warning': '#FFA500',
-                            'error': '#FF4444',
-                            'critical': '#CC0000'
-                        }
-                        color = severity_colors.get(event['severity'], swimlane['color'])
-                        
-                        # Add text annotation with smart positioning
-                        fig.add_annotation(
-                            x=event['time'],
-                            y=event['y_position'],
-                            text=event['wrapped_text'],
-                            textangle=event['angle'],
-                            showarrow=True,
-                            arrowhead=2,
-                            arrowsize=1,
-                            arrowwidth=1,
-                            arrowcolor=color,
-                            ax=event['arrow_x'],
-                            ay=event['arrow_y'],
-                            font=dict(size=event['font_size'], color=color),
-                            xref=f"x{i}",
-                            yref=f"y{i}",
-                            xanchor="left",
-                            yanchor="bottom",
-                            bgcolor="rgba(0,0,0,0.7)",
-                            bordercolor=color,
-                            borderwidth=1,
-                            borderpad=2
-                        )
-                        
-                elif events_data:  # Quarter/Year views - show hoverable markers
-                    for event in events_data:
-                        # Color based on severity
-                        severity_colors = {
-                            'info': swimlane['color'],
-                            'warning': '#FFA500',
-                            'error': '#FF4444',
-                            'critical': '#CC0000'
-                        }
-                        color = severity_colors.get(event['severity'], swimlane['color'])
-                        
-                        # Add scatter marker with hover text
-                        fig.add_trace(
-                            go.Scatter(
-                                x=[event['time']],
-                                y=[0.5],  # Center of swimlane
-                                mode='markers',
-                                marker=dict(
-                                    size=10,
-                                    color=color,
-                                    symbol='diamond',
-                                    line=dict(width=2, color='white')
-                                ),
-                                hovertemplate=f'<b>{event["text"]}</b><br>Severity: {event["severity"]}<br>Time: %{{x}}<extra></extra>',
-                                showlegend=False,
-                                name=""
-                            ),
-                            row=i, col=1
-                        )
-                
-                max_count = 1  # Set to 1 for proper scaling
-                
-            else:
-                # Handle regular measurement swimlanes (counts)
-                swimlane_counts_by_date = {date: 0 for date in all_dates}
-                
-                for stream_type in swimlane['streams']:
-                    stream_counts = daily_counts[daily_counts['stream_type'] == stream_type]
-                    for _, row in stream_counts.iterrows():
-                        if row['date'] in swimlane_counts_by_date:
-                            swimlane_counts_by_date[row['date']] += row['count']
-                
-                dates = [pd.Timestamp(date) + pd.Timedelta(hours=12) for date in all_dates]
-                counts = [swimlane_counts_by_date[date] for date in all_dates]
-                max_count = max(counts) if counts else 0
-                
-                show_text = zoom_level in ['Week', 'Month']
-                text_values = None
-                if show_text:
-                    text_values = [str(count) if count > 0 else '' for count in counts]
-                
-                fig.add_trace(
-                    go.Bar(
-                        x=dates,
-                        y=counts,
-                        name=swimlane['name'],
-                        marker_color=swimlane['color'],
-                        opacity=0.8,
-                        text=text_values,
-                        textposition="outside" if show_text else None,
-                        textfont=dict(color="white", size=9) if show_text else None,
-                        hovertemplate=f'<b>{swimlane["name"]}</b><br>Date: %{{x}}<br>Count: %{{y}}<br>Project: {project_id}<extra></extra>',
-                        showlegend=False
-                    ),
-                    row=i, col=1
-                )
+                    events_data.append({
+                        'time': event_time,
+                        'text': event_text,
+                        'severity': severity
+                    })
             
-            fig.update_yaxes(
-                showticklabels=False, 
-                showgrid=False,
-                zeroline=True,
-                zerolinecolor='rgba(0,0,0,0.3)',
-                range=[0, max_count * 1.5] if max_count > 0 else [0, 1],
-                row=i, col=1
-            )
+            # Sort events by time for better positioning
+            events_data.sort(key=lambda x: x['time'])
             
-            # Add swimlane background and weekend/holiday shading
-            if dates and len(dates) > 0:
-                hex_color = swimlane['color'].lstrip('#')
-                r, g, b = tuple(int(hex_color[j:j+2], 16) for j in (0, 2, 4))
-                y_max = max_count * 1.5 if max_count > 0 else 1
-                
-                # Use original date boundaries (not shifted) for background shapes
-                original_dates = [pd.Timestamp(date) for date in all_dates]
-                
-                # Add swimlane background
-                fig.add_shape(
-                    type="rect",
-                    x0=original_dates[0], x1=original_dates[-1] + pd.Timedelta(days=1),
-                    y0=0, y1=y_max,
-                    xref=f"x{i}", yref=f"y{i}",
-                    fillcolor=f"rgba({r},{g},{b},0.08)",
-                    line=dict(color=f"rgba({r},{g},{b},0.4)", width=1),
-                    layer="below",
-                    row=i, col=1
-                )
-                
-                # Weekend shading using original dates
-                for orig_date in original_dates:
-                    if orig_date.weekday() >= 5:  # Saturday (5) or Sunday (6)
-                        fig.add_shape(
-                            type="rect",
-                            x0=orig_date, x1=orig_date + pd.Timedelta(days=1),
-                            y0=0, y1=y_max,
-                            xref=f"x{i}", yref=f"y{i}",
-                            fillcolor="rgba(128,128,128,0.15)",
-                            line=dict(width=0),
-                            layer="below",
-                            row=i, col=1
-                        )
-                
-                # Public holiday shading (Australian public holidays)
-                # You can customize this list based on your location
-                public_holidays = get_public_holidays(original_dates[0].year if original_dates else pd.Timestamp.now().year)
-                
-                for orig_date in original_dates:
-                    # Check if this date is a public holiday
-                    if orig_date.date() in public_holidays:
-                        fig.add_shape(
-                            type="rect",
-                            x0=orig_date, x1=orig_date + pd.Timedelta(days=1),
-                            y0=0, y1=y_max,
-                            xref=f"x{i}", yref=f"y{i}",
-                            fillcolor="rgba(255,215,0,0.2)",  # Gold color for holidays
-                            line=dict(width=0),
-                            layer="below",
-                            row=i, col=1
-                        )
+            # Add a minimal bar to establish the timeline
+            empty_counts = [0] * len(date_index)
             
-            # Add right-side label
-            fig.add_annotation(
-                text=swimlane['name'],
-                x=1.02,
-                y=(len(measurement_swimlanes) - i + 0.5) / len(measurement_swimlanes),
-                xref="paper",
-                yref="paper",
-                showarrow=False,
-                font=dict(size=10, color=swimlane['color']),
-                xanchor="left",
-                yanchor="middle"
-            )
-        
-        # Configure x-axis formatting based on zoom level
-        if dates and len(dates) > 0:
-            original_dates = [pd.Timestamp(date) for date in all_dates]
+            traces.append(dict(
+                type='bar',
+                x=dates,
+                y=empty_counts,
+                name=swimlane['name'],
+                marker=dict(color='rgba(0,0,0,0)'),  # Invisible bars
+                showlegend=False,
+                hoverinfo='skip',
+                xaxis=xref, yaxis=yref
+            ))
             
-            if zoom_level == "Week":
-                fig.update_xaxes(
-                    tickmode='array',
-                    tickvals=original_dates,
-                    ticktext=[date.strftime('%a %m/%d') for date in original_dates],
-                    tickfont=dict(size=11),
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)'
-                )
-            elif zoom_level == "Month":
-                # Sample original dates for less crowded display
-                sample_dates = original_dates[::3] if len(original_dates) > 10 else original_dates
-                tick_texts = []
-                for date in sample_dates:
-                    week_num = date.isocalendar()[1]
-                    year_short = date.strftime('%y')
-                    month_day = date.strftime('%b %d')
-                    tick_texts.append(f"wk {week_num} ('{year_short})<br>{month_day}")
-                
-                fig.update_xaxes(
-                    tickmode='array',
-                    tickvals=sample_dates,
-                    ticktext=tick_texts,
-                    tickfont=dict(size=9),
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)'
-                )
-            elif zoom_level == "Quarter":
-                # Show starting weeks of each month only
-                month_start_dates = []
-                month_start_texts = []
-                
-                # Group dates by month and find the first date of each month
-                seen_months = set()
-                for date in original_dates:
-                    month_key = (date.year, date.month)
-                    if month_key not in seen_months:
-                        seen_months.add(month_key)
-                        # Find the first Monday or first day of this month in our data
-                        month_dates = [d for d in original_dates if d.year == date.year and d.month == date.month]
-                        if month_dates:
-                            # Use the first date of the month in our dataset
-                            first_date = min(month_dates)
-                            month_start_dates.append(first_date)
-                            month_start_texts.append(first_date.strftime('%b %Y'))
+            # Show text for Week/Month views, markers for Quarter/Year views
+            if zoom_level in ['Week', 'Month'] and events_data:
+                # Smart positioning to prevent overlap
+                positioned_events = position_events_without_overlap(events_data, zoom_level)
                 
-                # If no month starts found, fall back to sampling every 2 weeks
-                if not month_start_dates:
-                    month_start_dates = original_dates[::14] if len(original_dates) > 14 else original_dates
-                    month_start_texts = [d.strftime('%b %Y') for d in month_start_dates]
-                
-                fig.update_xaxes(
-                    tickmode='array',
-                    tickvals=month_start_dates,
-                    ticktext=month_start_texts,
-                    tickfont=dict(size=9),
-                    tickangle=0,  # Horizontal
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128,128,128,0.2)'
-                )
-            else:  # Year view
-                # For year view, show major month markers (quarterly or monthly depending on data size)
-                if len(original_dates) > 0:
-                    # Group by month and show first date of each month
-                    monthly_dates = []
-                    monthly_texts = []
-                    seen_months = set()
+                for event in positioned_events:
+                    # Color based on severity
+                    severity_colors = {
+                        'info': swimlane['color'],
+                        'warning': '#FFA500',
+                        'error': '#FF4444',
+                        'critical': '#CC0000'
+                    }
+                    color = severity_colors.get(event['severity'], swimlane['color'])
                     
-                    for date in original_dates:
-                        month_key = (date.year, date.month)
-                        if month_key not in seen_months:
-                            seen_months.add(month_key)
-                            # Add first date of this month
-                            month_dates = [d for d in original_dates if d.year == date.year and d.month == date.month]
-                            if month_dates:
-                                first_date = min(month_dates)
-                                monthly_dates.append(first_date)
-                                monthly_texts.append(first_date.strftime('%b %Y'))
+                    # Add text annotation with smart positioning
+                    annotations.append(dict(
+                        x=event['time'],
+                        y=event['y_position'],
+                        text=event['wrapped_text'],
+                        textangle=event['angle'],
+                        showarrow=True,
+                        arrowhead=2,
+                        arrowsize=1,
+                        arrowwidth=1,
+                        arrowcolor=color,
+                        ax=event['arrow_x'],
+                        ay=event['arrow_y'],
+                        font=dict(size=event['font_size'], color=color),
+                        xref=xref,
+                        yref=yref,
+                        xanchor="left",
+                        yanchor="bottom",
+                        bgcolor="rgba(0,0,0,0.7)",
+                        bordercolor=color,
+                        borderwidth=1,
+                        borderpad=2
+                    ))
                     
-                    # If too many months, sample every 2-3 months
-                    if len(monthly_dates) > 12:
-                        sample_dates = monthly_dates[::3]  # Every 3rd month (quarterly)
-                        tick_texts = [monthly_texts[i] for i in range(0, len(monthly_texts), 3)]
-                    elif len(monthly_dates) > 6:
-                        sample_dates = monthly_dates[::2]  # Every 2nd month
-                        tick_texts = [monthly_texts[i] for i in range(0, len(monthly_texts), 2)]
-                    else:
-                        sample_dates = monthly_dates
-                        tick_texts = monthly_texts
-                        
-                    # Fallback if no monthly data found
-                    if not sample_dates:
-                        sample_dates = original_dates[::max(1, len(original_dates)//10)]
-                        tick_texts = [date.strftime('%b %Y') for date in sample_dates]
-                else:
-                    # No dates available
-                    sample_dates = []
-                    tick_texts = []
+            elif events_data:  # Quarter/Year views - show hoverable markers
+                # Color based on severity
+                severity_colors = {
+                    'info': swimlane['color'],
+                    'warning': '#FFA500',
+                    'error': '#FF4444',
+                    'critical': '#CC0000'
+                }
                 
-                if sample_dates and tick_texts:
-                    fig.update_xaxes(
-                        tickmode='array',
-                        tickvals=sample_dates,
-                        ticktext=tick_texts,
-                        tickfont=dict(size=8),
-                        showgrid=True,
-                        gridwidth=1,
-                        gridcolor='rgba(128,128,128,0.2)'
-                    )
-                else:
-                    # Fallback to auto-formatting if no custom ticks
-                    fig.update_xaxes(
-                        tickfont=dict(size=8),
-                        showgrid=True,
-                        gridwidth=1,
-                        gridcolor='rgba(128,128,128,0.2)'
-                    )
-        
-        # Create title with time reference info
-        offset_text = f" (offset: {timeline_offset})" if timeline_offset != 0 else ""
-        title = f"Project {project_id} - {zoom_level} view: {window_start.strftime('%b %d')} to {window_end.strftime('%b %d, %Y')} | {len(window_df)} events | {time_label}{offset_text}"
+                # One marker trace for all events; text/severity ride along as customdata
+                traces.append(dict(
+                    type='scattergl' if len(events_data) > _WEBGL_MIN_POINTS else 'scatter',
+                    x=[event['time'] for event in events_data],
+                    y=[0.5] * len(events_data),  # Center of swimlane
+                    mode='markers',
+                    marker=dict(
+                        size=10,
+                        color=[severity_colors.get(event['severity'], swimlane['color']) for event in events_data],
+                        symbol='diamond',
+                        line=dict(width=2, color='white')
+                    ),
+                    customdata=[[event['text'], event['severity']] for event in events_data],
+                    hovertemplate='<b>%{customdata[0]}</b><br>Severity: %{customdata[1]}<br>Time: %{x}<extra></extra>',
+                    showlegend=False,
+                    name="",
+                    xaxis=xref, yaxis=yref
+                ))
+            
+            max_count = 1  # Set to 1 for proper scaling
+            
+        else:
+            # Handle regular measurement swimlanes (counts)
+            counts = lane_daily_counts[swimlane['name']].tolist()
+            
+            max_count = max(counts) if counts else 0
+            
+            bar = dict(
+                type='bar',
+                x=dates,
+                y=counts,
+                name=swimlane['name'],
+                marker=dict(color=swimlane['color']),
+                opacity=0.8,
+                hovertemplate=f'<b>{swimlane["name"]}</b><br>Date: %{{x}}<br>Count: %{{y}}<br>Project: {project_id}<extra></extra>',
+                showlegend=False,
+                xaxis=xref, yaxis=yref
+            )
+            if zoom_level in ['Week', 'Month']:
+                bar.update(
+                    text=[str(count) if count > 0 else '' for count in counts],
+                    textposition="outside",
+                    textfont=dict(color="white", size=9)
+                )
+            traces.append(bar)
         
-        fig.update_layout(
-            height=100 * len(measurement_swimlanes) + 100,
-            showlegend=False,
-            title=title,
-            title_x=0.5,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white'),
-            margin=dict(l=50, r=120, t=100, b=50)
+        layout[f"yaxis{suffix}"].update(
+            showticklabels=False, 
+            showgrid=False,
+            zeroline=True,
+            zerolinecolor='rgba(0,0,0,0.3)',
+            range=[0, max_count * 1.5] if max_count > 0 else [0, 1]
         )
         
-        return fig
+        # Add swimlane background and weekend/holiday shading
+        if len(dates) > 0:
+            hex_color = swimlane['color'].lstrip('#')
+            r, g, b = tuple(int(hex_color[j:j+2], 16) for j in (0, 2, 4))
+            y_max = max_count * 1.5 if max_count > 0 else 1
+            
+            # Use original date boundaries (not shifted) for background shapes
+            shapes.append(dict(
+                type="rect",
+                x0=date_index[0], x1=date_index[-1] + _ONE_DAY,
+                y0=0, y1=y_max,
+                xref=xref, yref=yref,
+                fillcolor=f"rgba({r},{g},{b},0.08)",
+                line=dict(color=f"rgba({r},{g},{b},0.4)", width=1),
+                layer="below"
+            ))
+            
+            # Weekend shading using original dates
+            for weekend_start, weekend_end in zip(weekend_starts, weekend_ends):
+                shapes.append(dict(
+                    type="rect",
+                    x0=weekend_start, x1=weekend_end,
+                    y0=0, y1=y_max,
+                    xref=xref, yref=yref,
+                    fillcolor="rgba(128,128,128,0.15)",
+                    line=dict(width=0),
+                    layer="below"
+                ))
+            
+            # Public holiday shading (Australian public holidays)
+            # You can customize this list in get_public_holidays
+            for holiday_start, holiday_end in zip(holiday_starts, holiday_ends):
+                shapes.append(dict(
+                    type="rect",
+                    x0=holiday_start, x1=holiday_end,
+                    y0=0, y1=y_max,
+                    xref=xref, yref=yref,
+                    fillcolor="rgba(255,215,0,0.2)",  # Gold color for holidays
+                    line=dict(width=0),
+                    layer="below"
+                ))
         
-    except Exception as e:
-        print(f"❌ Error in timeline graph for {project_id}: {e}")
-        return go.Figure().add_annotation(
-            text=f"Error for {project_id}: {str(e)}", 
-            xref="paper", yref="paper", 
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color="red")
-        )
+        # Add right-side label
+        annotations.append(dict(
+            text=swimlane['name'],
+            x=1.02,
+            y=(lane_count - i + 0.5) / lane_count,
+            xref="paper",
+            yref="paper",
+            showarrow=False,
+            font=dict(size=10, color=swimlane['color']),
+            xanchor="left",
+            yanchor="middle"
+        ))
+    
+    layout.update(shapes=shapes, annotations=annotations)
+    
+    # Configure x-axis formatting based on zoom level
+    # One DatetimeIndex serves every zoom level; strided tick values are
+    # taken as zero-copy views of its datetime64 buffer
+    dates_np = date_index.to_numpy()
+    x_ticks = {}
+    if len(date_index):
+        if zoom_level == "Week":
+            x_ticks = dict(
+                tickmode='array',
+                tickvals=dates_np,
+                ticktext=date_index.strftime('%a %m/%d').tolist(),
+                tickfont=_TICKFONT_11,
+                **_AXIS_GRID
+            )
+        elif zoom_level == "Month":
+            # Sample original dates for less crowded display
+            month_stride = 3 if len(date_index) > 10 else 1
+            sample_dates = dates_np[::month_stride]
+            # "wk 37 ('25)<br>Sep 09" labels, composed as string arrays
+            sample_index = date_index[::month_stride]
+            week_nums = sample_index.isocalendar().week.to_numpy(dtype=str)
+            tick_texts = np.char.add(
+                np.char.add("wk ", week_nums),
+                sample_index.strftime(" ('%y)<br>%b %d").to_numpy(dtype=str)
+            ).tolist()
+            
+            x_ticks = dict(
+                tickmode='array',
+                tickvals=sample_dates,
+                ticktext=tick_texts,
+                tickfont=_TICKFONT_9,
+                **_AXIS_GRID
+            )
+        elif zoom_level == "Quarter":
+            # Show starting weeks of each month only
+            month_start_dates, month_start_texts = _monthly_ticks(date_index, max_ticks=12)
+            
+            x_ticks = dict(
+                tickmode='array',
+                tickvals=month_start_dates,
+                ticktext=month_start_texts,
+                tickfont=_TICKFONT_9,
+                tickangle=0,  # Horizontal
+                **_AXIS_GRID
+            )
+        else:  # Year view
+            # For year view, show major month markers (every 2-3 months once there are more than 6)
+            sample_dates, tick_texts = _monthly_ticks(date_index, max_ticks=6)
+            
+            x_ticks = dict(
+                tickmode='array',
+                tickvals=sample_dates,
+                ticktext=tick_texts,
+                tickfont=_TICKFONT_8,
+                **_AXIS_GRID
+            )
+    
+    # Create title with time reference info
+    offset_text = f" (offset: {timeline_offset})" if timeline_offset != 0 else ""
+    title = f"Project {project_id} - {zoom_level} view: {window_start.strftime('%b %d')} to {window_end.strftime('%b %d, %Y')} | {len(window_df)} events | {time_label}{offset_text}"
+    
+    # Tick settings apply to every shared x-axis, as update_xaxes would
+    for key, value in layout.items():
+        if key.startswith('xaxis'):
+            value.update(x_ticks)
+    
+    layout.update(
+        _TIMELINE_LAYOUT,
+        height=100 * lane_count + 100,
+        title=dict(text=title, x=0.5)
+    )
+    
+    return dict(data=traces, layout=layout)
 
 # Create all callbacks after app initialization
 create_project_callbacks()
@@ -4,6 +4,9 @@ from typing import Optional, Dict, Any, List
 from pathlib import Path
 import yaml
 
+# libyaml's C loader when available, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 @dataclass
 class BrokerCfg:
     host: str = "localhost"
@@ -40,7 +43,7 @@ def load_config(path: str) -> AppCfg:
     p = Path(path)
     if not p.exists():
         raise FileNotFoundError(f"Config file not found: {p}")
-    raw = yaml.safe_load(p.read_text())
+    raw = yaml.load(p.read_text(), Loader=_YAML_LOADER)
 
     broker = BrokerCfg(**(raw.get("broker") or {}))
     streams = [StreamCfg(**s) for s in (raw.get("streams") or [])]
@@ -3,6 +3,7 @@ Continuous live publisher that streams data with no gaps - just a steady stream.
 """
 import asyncio
 import json
+import pickle
 import pandas as pd
 from datetime import datetime, timezone, timedelta
 from aiomqtt import Client
@@ -12,18 +13,34 @@ import logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger(__name__)
 
-async def run_continuous_live_publish(interval_seconds=2.0):
-    """Stream CSV data continuously with fixed intervals."""
+# orjson (optional "speedups" extra) serialises straight to bytes; payloads here
+# never contain NaN, so its output is equivalent to the stdlib's
+try:
+    import orjson
+
+    def dumps_message(msg):
+        return orjson.dumps(msg, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def dumps_message(msg):
+        return json.dumps(msg)
+
+# Unshuffled events of all CSVs, reused while no CSV is newer and the set of CSVs is the same
+EVENTS_CACHE = Path("data/live_events.replay.pkl")
+
+def load_live_events(data_files):
+    """Load every stream CSV as (stream_name, data) events, via EVENTS_CACHE when it is fresh."""
+    csv_files = [config["csv"] for config in data_files.values() if Path(config["csv"]).exists()]
+    newest_csv = max((Path(csv_file).stat().st_mtime for csv_file in csv_files), default=0)
     
-    # Configuration matching streams.yaml
-    data_files = {
-        "weights": {"csv": "data/weights.csv", "time_col": "created_at"},
-        "density_volume": {"csv": "data/density_volume.csv", "time_col": "created_at"}, 
-        "properties": {"csv": "data/properties.csv", "time_col": "created_at"},
-        "packs": {"csv": "data/packs.csv", "time_col": "created_at"},
-        "photos": {"csv": "data/photos.csv", "time_col": "created_at"},
-        "events": {"csv": "data/events.csv", "time_col": "created_at"}
-    }
+    if EVENTS_CACHE.exists() and EVENTS_CACHE.stat().st_mtime >= newest_csv:
+        try:
+            with EVENTS_CACHE.open("rb") as f:
+                cached = pickle.load(f)
+            if cached["csv_files"] == csv_files:
+                log.info(f"Loaded {len(cached['events'])} cached events from {EVENTS_CACHE}")
+                return cached["events"]
+        except Exception as e:
+            log.warning(f"Ignoring unreadable cache {EVENTS_CACHE}: {e}")
     
     # Load all events (no timestamp parsing needed)
     all_events = []
@@ -36,15 +53,39 @@ async def run_continuous_live_publish(interval_seconds=2.0):
                 df = pd.read_csv(csv_file)
                 log.info(f"Loaded {len(df)} rows from {csv_file}")
                 
-                # Add all rows
-                for _, row in df.iterrows():
-                    # Convert row to dict, excluding NaN values
-                    data = {k: v for k, v in row.to_dict().items() if pd.notna(v)}
-                    all_events.append((stream_name, data))
+                # Add all rows as plain dicts, excluding NaN values
+                all_events.extend(
+                    (stream_name, {k: v for k, v in record.items() if pd.notna(v)})
+                    for record in df.to_dict(orient="records")
+                )
                         
             except Exception as e:
                 log.warning(f"Could not load {csv_file}: {e}")
     
+    if all_events:
+        try:
+            with EVENTS_CACHE.open("wb") as f:
+                pickle.dump({"csv_files": csv_files, "events": all_events}, f)
+        except OSError as e:
+            log.warning(f"Could not write cache {EVENTS_CACHE}: {e}")
+    
+    return all_events
+
+async def run_continuous_live_publish(interval_seconds=2.0):
+    """Stream CSV data continuously with fixed intervals."""
+    
+    # Configuration matching streams.yaml
+    data_files = {
+        "weights": {"csv": "data/weights.csv", "time_col": "created_at"},
+        "density_volume": {"csv": "data/density_volume.csv", "time_col": "created_at"}, 
+        "properties": {"csv": "data/properties.csv", "time_col": "created_at"},
+        "packs": {"csv": "data/packs.csv", "time_col": "created_at"},
+        "photos": {"csv": "data/photos.csv", "time_col": "created_at"},
+        "events": {"csv": "data/events.csv", "time_col": "created_at"}
+    }
+    
+    all_events = load_live_events(data_files)
+    
     if not all_events:
         log.error("No events found in CSV files")
         return
@@ -77,7 +118,7 @@ async def run_continuous_live_publish(interval_seconds=2.0):
                 }
                 
                 # Publish message
-                await client.publish(topic, json.dumps(msg))
+                await client.publish(topic, dumps_message(msg))
                 
                 log.info(f"[LIVE #{event_count}] {stream_name} → {topic} @ {current_time.strftime('%H:%M:%S')}")
                 
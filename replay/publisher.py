@@ -1,4 +1,4 @@
-import asyncio, json
+import asyncio, json, socket
 from aiomqtt import Client, MqttError
 from typing import Dict, Any
 from .config import AppCfg
@@ -7,25 +7,53 @@ import logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 log = logging.getLogger(__name__)
 
+# Publishes run as tasks so acknowledgements overlap; at most this many are
+# left in flight before the publisher waits for them
+PUBLISH_BATCH = 100
+
+# Broker connection tuned for bursts of small messages: more QoS>0 publishes in
+# flight than paho's default of 20, and no Nagle delay before each packet
+CLIENT_OPTIONS = dict(
+    keepalive=60,
+    clean_session=True,
+    max_inflight_messages=1000,
+    socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+)
+
 async def run_publish(cfg: AppCfg):
     auth = {}
     if cfg.broker.username:
         auth = {"username": cfg.broker.username, "password": cfg.broker.password}
     
+    # Per-event lookups resolved once up front
+    topics = {s.id: s.topic for s in cfg.streams}
+    stream_jsons = {s.id: json.dumps(s.id) for s in cfg.streams}
+    qos, retain = cfg.broker.qos, cfg.broker.retain
+    
     event_count = 0
+    pending = []
     try:
-        async with Client(cfg.broker.host, cfg.broker.port, **auth) as client:
-            async for ts, stream_id, payload in merged_events(cfg):
+        async with Client(cfg.broker.host, cfg.broker.port, **auth, **CLIENT_OPTIONS) as client:
+            async for ts, stream_id, payload, payload_json in merged_events(cfg):
                 event_count += 1
-                topic = next(s.topic for s in cfg.streams if s.id == stream_id)
-                msg = {"ts": ts.isoformat(), "stream": stream_id, "data": payload}
+                topic = topics[stream_id]
+                # Same text as json.dumps of the full message, around the pre-serialised payload
+                msg = f'{{"ts": "{ts.isoformat()}", "stream": {stream_jsons[stream_id]}, "data": {payload_json}}}'
                 event_time = payload.get('created_at') or ts.strftime('%Y-%m-%d %H:%M:%S')
                 log.info(f"[PUBLISH #{event_count}] {stream_id} → {topic} @ {event_time}")
-                await client.publish(topic, json.dumps(msg), qos=cfg.broker.qos, retain=cfg.broker.retain)
+                pending.append(asyncio.create_task(
+                    client.publish(topic, msg, qos=qos, retain=retain)
+                ))
+                if len(pending) >= PUBLISH_BATCH:
+                    await asyncio.gather(*pending)
+                    pending.clear()
                 
                 # Log progress every 100 events
                 if event_count % 100 == 0:
                     log.info(f"[PROGRESS] Published {event_count} events, latest: {event_time}")
+            
+            # Wait for the last partial batch before disconnecting
+            await asyncio.gather(*pending)
                     
     except Exception as e:
         log.error(f"[ERROR] Publisher stopped after {event_count} events: {e}")
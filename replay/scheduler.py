@@ -1,41 +1,74 @@
 from __future__ import annotations
 
 import asyncio
-import heapq
+import json
 import time
-from itertools import count
+from pathlib import Path
 from typing import AsyncIterator, Tuple, Dict, Any, Optional
 
 import pandas as pd
-from dateutil import parser
 
 from .config import AppCfg, StreamCfg
 
+# Columns added by the scheduler itself; everything else is event payload
+_INTERNAL_COLUMNS = ("_ts", "_payload_json")
 
-def _parse_ts(s: str, fmt: Optional[str], tzname: Optional[str]) -> pd.Timestamp:
+# Bumped whenever the cached frame layout changes, so older caches are rebuilt
+_CACHE_FORMAT = 3
+
+# Pacing waits shorter than this are skipped (the event goes out up to this early);
+# events emitted back-to-back still hand control to the event loop every _YIELD_EVERY
+_MIN_SLEEP = 0.001
+_YIELD_EVERY = 100
+
+
+def _parse_ts_column(col: pd.Series, fmt: Optional[str], tzname: Optional[str]) -> pd.Series:
     """
-    Parse a timestamp string using an optional format and timezone, returning UTC.
-    - If fmt is provided, use it (coerce errors to NaT).
-    - Otherwise try tolerant parsing with pandas; fall back to dateutil.
-    - Localize to tzname if naive, then convert to UTC.
+    Parse a column of timestamp strings using an optional format and timezone, returning UTC.
+    - If fmt is provided, use it (coerce errors to NaT) and localize to tzname if naive.
+    - Otherwise parse each value tolerantly (epoch/ISO8601, keeping tz if present, naive as UTC).
+    Unparseable values become NaT.
     """
-    if fmt:
-        ts = pd.to_datetime(s, format=fmt, errors="coerce")
-    else:
-        try:
-            # tolerant: supports epoch/ISO8601, keep tz if present
-            ts = pd.to_datetime(s, utc=True, errors="coerce")
-        except Exception:
-            ts = pd.to_datetime(parser.parse(s))
-    if tzname and ts.tzinfo is None:
-        ts = ts.tz_localize(tzname)
-    return ts.tz_convert("UTC") if ts.tzinfo else ts.tz_localize("UTC")
+    col = col.astype(str)
+    if not fmt:
+        return pd.to_datetime(col, format="mixed", utc=True, errors="coerce")
+    ts = pd.to_datetime(col, format=fmt, errors="coerce")
+    if ts.dt.tz is None:
+        ts = ts.dt.tz_localize(tzname or "UTC")
+    return ts.dt.tz_convert("UTC")
 
 
 def _load_stream(s: StreamCfg) -> pd.DataFrame:
+    """
+    Load a stream's parsed frame, reusing the cache written next to its CSV while
+    the CSV is older than the cache and the stream settings are unchanged.
+    """
+    csv_path = Path(s.csv)
+    cache = csv_path.with_suffix(".replay.pkl")
+    key = f"{_CACHE_FORMAT}:{s!r}"
+
+    if cache.exists() and cache.stat().st_mtime >= csv_path.stat().st_mtime:
+        try:
+            cached = pd.read_pickle(cache)
+            if cached["key"] == key:
+                return cached["df"]
+        except Exception as e:
+            print(f"[scheduler] Note: ignoring unreadable cache {cache}: {e}")
+
+    df = _read_stream_csv(s)
+    try:
+        pd.to_pickle({"key": key, "df": df}, cache)
+    except OSError as e:
+        print(f"[scheduler] Note: could not cache {s.csv}: {e}")
+    return df
+
+
+def _read_stream_csv(s: StreamCfg) -> pd.DataFrame:
     """
     Load a CSV defined by StreamCfg, apply optional renames and per-column types from s.schema,
-    add an internal UTC timestamp column '_ts', drop NaT rows if requested, and return sorted.
+    add an internal UTC timestamp column '_ts', drop NaT rows if requested, sort, and add the
+    pre-serialised JSON payload of each row as '_payload_json'. Repetitive text columns are
+    stored as categoricals to keep the frame (and its cache) small.
     """
     df = pd.read_csv(s.csv)
 
@@ -75,27 +108,45 @@ def _load_stream(s: StreamCfg) -> pd.DataFrame:
         )
 
     # Parse timestamps to UTC
-    df["_ts"] = df[s.time_col].apply(lambda x: _parse_ts(str(x), s.time_fmt, s.tz))
+    df["_ts"] = _parse_ts_column(df[s.time_col], s.time_fmt, s.tz)
 
     if s.drop_na_time:
         df = df.dropna(subset=["_ts"])
 
-    return df.sort_values("_ts").reset_index(drop=True)
+    df = df.sort_values("_ts").reset_index(drop=True)
 
+    # Serialise each row's payload once here (and into the cache) instead of per publish
+    columns = [c for c in df.columns if c not in _INTERNAL_COLUMNS]
+    df["_payload_json"] = [
+        json.dumps(dict(zip(columns, row))) for row in df[columns].itertuples(index=False, name=None)
+    ]
 
-def _clip(df: pd.DataFrame, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> pd.DataFrame:
-    """Restrict events to [start, end] window (inclusive)."""
-    if start is not None:
-        df = df[df["_ts"] >= start]
-    if end is not None:
-        df = df[df["_ts"] <= end]
+    # Categoricals iterate back to the same values; floats stay float64 so payloads are unchanged
+    for col in columns:
+        dtype = df[col].dtype
+        if (dtype == object or dtype == "str") and df[col].nunique() < len(df) // 2:
+            df[col] = df[col].astype("category")
     return df
 
 
-async def merged_events(cfg: AppCfg) -> AsyncIterator[Tuple[pd.Timestamp, str, Dict[str, Any]]]:
+def _clip(df: pd.DataFrame, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> pd.DataFrame:
     """
-    Merge multiple streams in timestamp order and yield (ts, stream_id, payload) at
-    real-time pace scaled by cfg.speed. Uses a heap with deterministic tie-breaking.
+    Restrict events to [start, end] window (inclusive).
+    The frame is sorted by _ts (NaT last), so the window is a positional slice.
+    """
+    if start is None and end is None:
+        return df
+    ts = df["_ts"]
+    lo = ts.searchsorted(start, side="left") if start is not None else 0
+    # Any NaT rows sort last and are outside every window
+    hi = ts.searchsorted(end, side="right") if end is not None else len(ts) - int(ts.isna().sum())
+    return df.iloc[lo:hi]
+
+
+async def merged_events(cfg: AppCfg) -> AsyncIterator[Tuple[pd.Timestamp, str, Dict[str, Any], str]]:
+    """
+    Merge multiple streams in timestamp order and yield (ts, stream_id, payload, payload_json)
+    at real-time pace scaled by cfg.speed. Ties are broken by stream id, then stream order.
     """
     frames: list[tuple[StreamCfg, pd.DataFrame]] = []
     for s in cfg.streams:
@@ -106,75 +157,80 @@ async def merged_events(cfg: AppCfg) -> AsyncIterator[Tuple[pd.Timestamp, str, D
     start = pd.to_datetime(cfg.start).tz_localize("UTC") if cfg.start else None
     end = pd.to_datetime(cfg.end).tz_localize("UTC") if cfg.end else None
 
-    # Min-heap of (ts, stream_id, tie, iterator, current_row)
-    heaps: list[tuple[pd.Timestamp, str, int, Any, pd.Series]] = []
-    tie = count()
+    # Replay order as (ts, stream_id, row) keys, merged with one stable sort;
+    # each stream's payload columns and row tuples are kept separately so
+    # payloads keep their own columns and value types
+    rows_by_stream: dict[str, tuple[list[str], list[tuple], list[str]]] = {}
+    keys: list[pd.DataFrame] = []
 
+    latest_ts = None
     for s, df in frames:
         df = _clip(df, start, end)
-        it = df.iterrows()
-        try:
-            _, row = next(it)
-            heapq.heappush(heaps, (row["_ts"], s.id, next(tie), it, row))
-        except StopIteration:
-            pass
+        # Frames are sorted with any NaT rows last, so the last timed row is this stream's latest event
+        last = len(df) - int(df["_ts"].isna().sum()) - 1
+        if last >= 0 and (latest_ts is None or df["_ts"].iloc[last] > latest_ts):
+            latest_ts = df["_ts"].iloc[last]
+        columns = [c for c in df.columns if c not in _INTERNAL_COLUMNS]
+        rows_by_stream[s.id] = (
+            columns,
+            list(df[columns].itertuples(index=False, name=None)),
+            df["_payload_json"].tolist(),
+        )
+        keys.append(pd.DataFrame({"ts": df["_ts"].reset_index(drop=True), "stream_id": s.id, "row": range(len(df))}))
 
-    if not heaps:
+    order = pd.concat(keys, ignore_index=True) if keys else pd.DataFrame()
+    if order.empty:
         print("[scheduler] No events to replay")
         return
+    order = order.sort_values(["ts", "stream_id"], kind="mergesort")
 
-    # Find earliest and latest timestamps across all streams
-    sim_start_ts = heaps[0][0]  # earliest event timestamp
-    
-    # Find the latest timestamp by looking at the last event in each stream
-    latest_ts = sim_start_ts
-    for s, df in frames:
-        df = _clip(df, start, end)
-        if not df.empty:
-            stream_latest = df["_ts"].max()
-            if stream_latest > latest_ts:
-                latest_ts = stream_latest
+    # Earliest timestamp across all streams (the latest was found while clipping)
+    sim_start_ts = order["ts"].iloc[0]
     
     print(f"[scheduler] Replaying events from {sim_start_ts} to {latest_ts}")
     print(f"[scheduler] Time span: {(latest_ts - sim_start_ts).total_seconds():.0f} seconds ({(latest_ts - sim_start_ts).days} days)")
     print(f"[scheduler] Speed: {cfg.speed}x (will take ~{(latest_ts - sim_start_ts).total_seconds() / cfg.speed:.1f} seconds)")
 
     # pacing controls
-    wall_start = time.perf_counter()
     speed = max(0.0001, float(cfg.speed))  # avoid zero or negative
-    prev_ts = sim_start_ts  # track previous event timestamp for gap detection
+    # Simulated seconds since the first event, and their wall-clock offsets, for all events at once
+    sim_deltas = (order["ts"] - sim_start_ts).dt.total_seconds().to_numpy()
+    wall_offsets = sim_deltas / speed
+    wall_start = time.perf_counter()
+    prev_delta = 0.0  # track previous event offset for gap detection
+    since_yield = 0  # events emitted without giving the event loop a turn
 
-    while heaps:
-        ts, stream_id, _, it, row = heapq.heappop(heaps)
+    for ts, stream_id, row, sim_delta, wall_offset in zip(
+        order["ts"], order["stream_id"], order["row"], sim_deltas.tolist(), wall_offsets.tolist()
+    ):
 
         # wall-clock pacing to simulate real time at configured speed
-        sim_delta = (ts - sim_start_ts).total_seconds()
-        target_wall = wall_start + sim_delta / speed
+        target_wall = wall_start + wall_offset
         now = time.perf_counter()
         sleep_time = target_wall - now
         
         # Cap maximum wait time to 2 seconds to skip large gaps
         # Calculate actual gap between consecutive events
-        event_gap = (ts - prev_ts).total_seconds()
+        event_gap = sim_delta - prev_delta
         if sleep_time > 2:
             print(f"[scheduler] Large gap detected: {event_gap:.1f}s between events, capping wait at 2s")
             sleep_time = 2
             
-        if sleep_time > 0:
+        if sleep_time > _MIN_SLEEP:
             await asyncio.sleep(sleep_time)
+            since_yield = 0
+        else:
+            since_yield += 1
+            if since_yield >= _YIELD_EVERY:
+                await asyncio.sleep(0)
+                since_yield = 0
         
-        # Update previous timestamp for next iteration
-        prev_ts = ts
-
-        # emit event (exclude internal column)
-        payload = {k: (None if k == "_ts" else v) for k, v in row.items() if k != "_ts"}
-        yield ts, stream_id, payload
+        # Update previous offset for next iteration
+        prev_delta = sim_delta
 
-        # push next from this stream
-        try:
-            _, row2 = next(it)
-            heapq.heappush(heaps, (row2["_ts"], stream_id, next(tie), it, row2))
-        except StopIteration:
-            pass
+        # emit event (internal columns already excluded)
+        columns, rows, payload_jsons = rows_by_stream[stream_id]
+        payload = dict(zip(columns, rows[row]))
+        yield ts, stream_id, payload, payload_jsons[row]
     
     print("[scheduler] Done - all events replayed")
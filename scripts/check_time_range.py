@@ -18,10 +18,14 @@ def main():
         client = InfluxDBClient(url=INFLUXDB_URL, token=INFLUXDB_TOKEN, org=INFLUXDB_ORG)
         query_api = client.query_api()
         
-        # Check sample timestamps and data
+        # Check sample timestamps and data; first()/last() pick each series' end
+        # row in storage, so only one row per series is sorted here
         sample_query = f'''
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: -6h)
+        |> first()
+        |> keep(columns: ["_time", "_measurement"])
+        |> group()
         |> sort(columns: ["_time"], desc: false)
         |> limit(n: 5)
         '''
@@ -36,6 +40,9 @@ def main():
         latest_query = f'''
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: -6h)
+        |> last()
+        |> keep(columns: ["_time", "_measurement"])
+        |> group()
         |> sort(columns: ["_time"], desc: true)
         |> limit(n: 5)
         '''
@@ -51,6 +58,9 @@ def main():
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: -1h)
         |> count()
+        |> group(columns: ["_measurement"])
+        |> sum()
+        |> keep(columns: ["_measurement", "_value"])
         '''
         
         print("\n📊 Records in last 1 hour:")
@@ -5,6 +5,7 @@ Debug InfluxDB data with wider time ranges
 
 from influxdb_client import InfluxDBClient
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 INFLUXDB_URL = "http://localhost:8086"
@@ -26,16 +27,25 @@ def main():
             ("All time", "-30d"),
         ]
         
-        for name, range_str in queries:
-            print(f"\n📊 Total records ({name}):")
+        def count_records(range_str):
             count_query = f'''
             from(bucket: "{INFLUXDB_BUCKET}")
             |> range(start: {range_str})
             |> count()
+            |> group(columns: ["_measurement"])
+            |> sum()
+            |> keep(columns: ["_measurement", "_value"])
             '''
-            
+            return query_api.query(count_query)
+        
+        # The counts are independent, so run them concurrently and print in order
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = [executor.submit(count_records, range_str) for _, range_str in queries]
+        
+        for (name, range_str), future in zip(queries, futures):
+            print(f"\n📊 Total records ({name}):")
             try:
-                result = query_api.query(count_query)
+                result = future.result()
                 found_data = False
                 for table in result:
                     for record in table.records:
@@ -51,6 +61,7 @@ def main():
         no_time_query = f'''
         from(bucket: "{INFLUXDB_BUCKET}")
         |> limit(n: 3)
+        |> keep(columns: ["_time", "_measurement", "_field", "_value"])
         '''
         
         try:
@@ -17,6 +17,7 @@ import threading
 MQTT_HOST = os.getenv("MQTT_HOST", "localhost")
 MQTT_PORT = int(os.getenv("MQTT_PORT", "1883"))
 CHECK_INTERVAL = 30  # seconds
+CONNECT_TIMEOUT = 5  # seconds to wait for the broker when not connected
 HEALTH_FILE = "/tmp/mqtt_broker_health.json"
 
 # Setup logging
@@ -33,51 +34,53 @@ class MQTTHealthChecker:
         self.error_count = 0
         self.running = True
         self.connection_successful = False
+        self.client = None
+        self.connected = threading.Event()
         
     def on_connect(self, client, userdata, flags, reason_code, *args):
         if reason_code == 0:
-            self.connection_successful = True
-            self.is_connected = True
+            self.connected.set()
             self.error_count = 0
             logger.info(f"✅ MQTT broker connected at {MQTT_HOST}:{MQTT_PORT}")
         else:
-            self.connection_successful = False
-            self.is_connected = False
-            self.error_count += 1
+            self.connected.clear()
             logger.error(f"❌ MQTT broker connection failed: {reason_code}")
     
-    def on_disconnect(self, client, userdata, reason_code, *args):
-        # Don't mark as failed if we successfully connected first
-        if self.connection_successful:
-            logger.info(f"🔌 MQTT broker disconnected (normal after health check)")
-        else:
-            logger.warning(f"🔌 MQTT broker disconnected: {reason_code}")
-        self.is_connected = False
+    def on_disconnect(self, client, userdata, flags, reason_code, *args):
+        self.connected.clear()
+        if self.running:
+            logger.warning(f"🔌 MQTT broker disconnected: {reason_code} (reconnecting)")
+    
+    def start_client(self):
+        """Open the persistent broker connection; paho's network thread keeps it alive and reconnects"""
+        self.client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
+        self.client.on_connect = self.on_connect
+        self.client.on_disconnect = self.on_disconnect
+        self.client.reconnect_delay_set(min_delay=1, max_delay=CHECK_INTERVAL)
+        
+        # The 10s keepalive pings the broker, so a lost broker is noticed well within CHECK_INTERVAL
+        self.client.connect_async(MQTT_HOST, MQTT_PORT, 10)
+        self.client.loop_start()
+    
+    def stop_client(self):
+        """Close the persistent broker connection"""
+        if self.client:
+            self.client.disconnect()
+            self.client.loop_stop()
+            self.client = None
     
     def check_broker(self):
         """Perform a single broker connectivity check"""
         try:
-            # Reset connection status for this check
-            self.connection_successful = False
-            self.is_connected = False
-            
-            client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
-            client.on_connect = self.on_connect
-            client.on_disconnect = self.on_disconnect
-            
-            # Set timeout
-            client.socket_timeout = 5.0
-            client.connect_timeout = 5.0
-            
-            # Try to connect
-            client.connect(MQTT_HOST, MQTT_PORT, 10)
-            client.loop_start()
-            
-            # Wait for connection result
-            time.sleep(2)
+            if self.client is None:
+                self.start_client()
             
-            client.loop_stop()
-            client.disconnect()
+            # Returns at once while connected; only waits while the broker is (re)connecting
+            self.connection_successful = self.connected.wait(timeout=CONNECT_TIMEOUT)
+            self.is_connected = self.connection_successful
+            if not self.connection_successful:
+                self.error_count += 1
+                logger.error(f"❌ MQTT broker not reachable at {MQTT_HOST}:{MQTT_PORT}")
             
             self.last_check = datetime.now()
             
@@ -130,11 +133,13 @@ class MQTTHealthChecker:
                 logger.error(f"Unexpected error in health checker: {e}")
                 time.sleep(CHECK_INTERVAL)
         
+        self.stop_client()
         logger.info("👋 MQTT health checker stopped")
     
     def stop(self):
         """Stop the daemon"""
         self.running = False
+        self.stop_client()
 
 def signal_handler(signum, frame):
     """Handle shutdown signals"""
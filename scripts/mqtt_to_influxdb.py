@@ -7,17 +7,39 @@ Subscribes to MQTT topics and writes data to InfluxDB with proper schema.
 import os
 import sys
 import json
-import time
 import logging
+import math
 import signal
 import threading
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
 import paho.mqtt.client as mqtt
 import dateutil.parser
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client import InfluxDBClient
+from influxdb_client.client.write_api import WriteOptions
+
+# orjson (optional "speedups" extra) parses the raw payload bytes directly; it rejects
+# the NaN/Infinity literals the stdlib emits, so those messages fall back to json
+try:
+    import orjson
+
+    def loads_message(payload: bytes) -> Any:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            return json.loads(payload.decode('utf-8'))
+except ImportError:
+    def loads_message(payload: bytes) -> Any:
+        return json.loads(payload.decode('utf-8'))
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, using dateutil only for strings fromisoformat rejects"""
+    try:
+        # fromisoformat only accepts a trailing 'Z' from Python 3.11
+        return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except (TypeError, ValueError, AttributeError):
+        return dateutil.parser.parse(value)
 
 # Configuration
 MQTT_HOST = os.getenv("MQTT_HOST", "localhost")
@@ -29,6 +51,64 @@ INFLUXDB_TOKEN = os.getenv("INFLUXDB_TOKEN", "dt-lab-token-2025-secure-key-for-a
 INFLUXDB_ORG = os.getenv("INFLUXDB_ORG", "lab")
 INFLUXDB_BUCKET = os.getenv("INFLUXDB_BUCKET", "measurements")
 
+# Also store each message's full JSON as a 'raw_payload' string field (debugging aid;
+# roughly doubles the bytes written per point)
+STORE_RAW_PAYLOAD = os.getenv("STORE_RAW_PAYLOAD", "0") == "1"
+
+# Points are buffered and written in batches (flushed at 500 points or after 1s)
+# instead of one HTTP request per MQTT message
+WRITE_OPTIONS = WriteOptions(
+    batch_size=500,
+    flush_interval=1000,
+    jitter_interval=200,
+    retry_interval=5000
+)
+
+# Field value conversions by JSON value type; anything else is stored as a string.
+# Booleans have always been written as floats (0.0/1.0), and InfluxDB rejects
+# a field whose type changes, so they stay floats
+FIELD_TYPES = {int: float, float: float, bool: float}
+
+# Line protocol escaping, as done by influxdb_client's Point
+EPOCH = datetime.fromtimestamp(0, tz=timezone.utc)
+ESCAPE_MEASUREMENT = str.maketrans({',': r'\,', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+ESCAPE_KEY = str.maketrans({',': r'\,', '=': r'\=', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+ESCAPE_STRING = str.maketrans({'"': r'\"', '\\': r'\\'})
+
+def to_line_protocol(measurement: str, tags: Dict[str, str], fields: Dict[str, Any],
+                     timestamp: Optional[datetime]) -> str:
+    """Encode one point as a line protocol string (empty if it has no fields)"""
+    field_parts = []
+    for key, value in sorted(fields.items()):
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                continue
+            text = str(value)
+            field_parts.append(f"{key.translate(ESCAPE_KEY)}={text[:-2] if text.endswith('.0') else text}")
+        elif isinstance(value, int):
+            field_parts.append(f"{key.translate(ESCAPE_KEY)}={value}i")
+        else:
+            field_parts.append(f'{key.translate(ESCAPE_KEY)}="{value.translate(ESCAPE_STRING)}"')
+    if not field_parts:
+        return ""
+    
+    line = measurement.translate(ESCAPE_MEASUREMENT)
+    for key, value in sorted(tags.items()):
+        key = key.translate(ESCAPE_KEY)
+        value = value.translate(ESCAPE_KEY)
+        if value.endswith('\\'):
+            value += ' '
+        if key and value:
+            line += f",{key}={value}"
+    line += " " + ",".join(field_parts)
+    
+    if timestamp is not None:
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        delta = timestamp - EPOCH
+        line += f" {(delta.days * 86400 + delta.seconds) * 10**9 + delta.microseconds * 1000}"
+    return line
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +119,7 @@ logger = logging.getLogger(__name__)
 class MQTTInfluxDBPipeline:
     def __init__(self):
         self.running = True
+        self.stopped = threading.Event()
         self.mqtt_client = None
         self.influx_client = None
         self.write_api = None
@@ -51,9 +132,13 @@ class MQTTInfluxDBPipeline:
             self.influx_client = InfluxDBClient(
                 url=INFLUXDB_URL,
                 token=INFLUXDB_TOKEN,
-                org=INFLUXDB_ORG
+                org=INFLUXDB_ORG,
+                enable_gzip=True  # batches of line protocol compress well
+            )
+            self.write_api = self.influx_client.write_api(
+                write_options=WRITE_OPTIONS,
+                error_callback=self.on_write_error
             )
-            self.write_api = self.influx_client.write_api(write_options=SYNCHRONOUS)
             logger.info(f"✅ InfluxDB client connected to {INFLUXDB_URL}")
             return True
         except Exception as e:
@@ -85,37 +170,26 @@ class MQTTInfluxDBPipeline:
         
         return tags
     
-    def create_influx_point(self, topic: str, payload: Dict[str, Any]) -> Optional[Point]:
-        """Create InfluxDB Point from MQTT message"""
+    def create_influx_point(self, topic: str, payload: Dict[str, Any]) -> Optional[str]:
+        """Create InfluxDB point (as line protocol) from MQTT message"""
         try:
             # Extract measurement name from topic
             topic_parts = topic.split('/')
             measurement = topic_parts[1] if len(topic_parts) >= 2 else 'unknown'
             
-            # Create point
-            point = Point(measurement)
-            
-            # Add tags from topic
-            topic_tags = self.extract_tags_from_topic(topic)
-            for key, value in topic_tags.items():
-                point = point.tag(key, value)
-            
-            # Add tags from payload
-            payload_tags = self.extract_tags_from_payload(payload)
-            for key, value in payload_tags.items():
-                point = point.tag(key, value)
+            # Tags from topic, then from payload
+            tags = self.extract_tags_from_topic(topic)
+            tags.update(self.extract_tags_from_payload(payload))
+            fields = {}
             
             # Handle timestamp
             timestamp = None
             if 'ts' in payload:
                 try:
-                    timestamp = dateutil.parser.parse(payload['ts'])
+                    timestamp = parse_timestamp(payload['ts'])
                 except Exception as e:
                     logger.warning(f"Failed to parse timestamp {payload['ts']}: {e}")
             
-            if timestamp:
-                point = point.time(timestamp)
-            
             # Add fields from payload data
             if 'data' in payload:
                 data = payload['data']
@@ -123,15 +197,10 @@ class MQTTInfluxDBPipeline:
                     for key, value in data.items():
                         if key not in ['ts', 'timestamp']:  # Skip timestamp fields
                             # Determine field type
-                            if isinstance(value, (int, float)):
-                                point = point.field(key, float(value))
-                            elif isinstance(value, bool):
-                                point = point.field(key, value)
-                            else:
-                                point = point.field(key, str(value))
+                            fields[key] = FIELD_TYPES.get(type(value), str)(value)
                 else:
                     # If data is not a dict, store as a single field
-                    point = point.field('value', str(data))
+                    fields['value'] = str(data)
             
             # Special handling for events
             if measurement == 'events':
@@ -141,20 +210,26 @@ class MQTTInfluxDBPipeline:
                     if isinstance(event_data, dict):
                         for field in ['text', 'severity']:
                             if field in event_data:
-                                point = point.field(field, str(event_data[field]))
-                    point = point.field('event_count', 1)  # For counting events
+                                fields[field] = str(event_data[field])
+                    fields['event_count'] = 1  # For counting events
             
             # Add raw payload as JSON field for debugging
-            point = point.field('raw_payload', json.dumps(payload))
+            if STORE_RAW_PAYLOAD:
+                fields['raw_payload'] = json.dumps(payload)
             
-            return point
+            return to_line_protocol(measurement, tags, fields, timestamp)
             
         except Exception as e:
             logger.error(f"Failed to create InfluxDB point: {e}")
             return None
     
-    def write_to_influxdb(self, point: Point):
-        """Write point to InfluxDB"""
+    def on_write_error(self, conf, data, exception):
+        """Batch write failure callback (runs on the write API's background thread)"""
+        self.error_count += 1
+        logger.error(f"Failed to write batch to InfluxDB: {exception}")
+    
+    def write_to_influxdb(self, point: str):
+        """Queue point for the next batch write to InfluxDB"""
         try:
             self.write_api.write(bucket=INFLUXDB_BUCKET, record=point)
             self.message_count += 1
@@ -178,7 +253,7 @@ class MQTTInfluxDBPipeline:
         """MQTT message callback"""
         try:
             # Parse JSON payload
-            payload = json.loads(msg.payload.decode('utf-8'))
+            payload = loads_message(msg.payload)
             
             # Create InfluxDB point
             point = self.create_influx_point(msg.topic, payload)
@@ -189,7 +264,7 @@ class MQTTInfluxDBPipeline:
                 
                 # Log sample messages for debugging
                 if self.message_count % 50 == 0:
-                    logger.info(f"📨 Sample: {msg.topic} -> {point._name}")
+                    logger.info(f"📨 Sample: {msg.topic} -> {point.partition(' ')[0]}")
             
         except json.JSONDecodeError as e:
             logger.warning(f"Failed to parse JSON from {msg.topic}: {e}")
@@ -198,7 +273,7 @@ class MQTTInfluxDBPipeline:
             logger.error(f"Error processing message from {msg.topic}: {e}")
             self.error_count += 1
     
-    def on_disconnect(self, client, userdata, reason_code, properties=None):
+    def on_disconnect(self, client, userdata, flags, reason_code, properties=None):
         """MQTT disconnect callback"""
         logger.warning(f"🔌 MQTT disconnected: {reason_code}")
     
@@ -235,20 +310,11 @@ class MQTTInfluxDBPipeline:
         # Start MQTT loop
         self.mqtt_client.loop_start()
         
-        # Status reporting thread
-        def status_reporter():
-            while self.running:
-                time.sleep(30)  # Report every 30 seconds
-                if self.running:
-                    logger.info(f"📊 Status: {self.message_count} messages processed, {self.error_count} errors")
-        
-        status_thread = threading.Thread(target=status_reporter, daemon=True)
-        status_thread.start()
-        
         try:
-            # Keep running until interrupted
-            while self.running:
-                time.sleep(1)
+            # Report status every 30 seconds until stopped or interrupted; the main
+            # thread just waits here, Paho and the write API have their own threads
+            while not self.stopped.wait(30):
+                logger.info(f"📊 Status: {self.message_count} messages processed, {self.error_count} errors")
                 
         except KeyboardInterrupt:
             logger.info("🛑 Pipeline stopped by user")
@@ -277,6 +343,7 @@ class MQTTInfluxDBPipeline:
     def stop(self):
         """Stop the pipeline"""
         self.running = False
+        self.stopped.set()
 
 # Global pipeline instance for signal handling
 pipeline = None
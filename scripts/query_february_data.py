@@ -23,36 +23,38 @@ def main():
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: 2025-02-01T00:00:00Z, stop: 2025-02-28T23:59:59Z)
         |> count()
+        |> group(columns: ["_measurement"])
+        |> sum()
+        |> keep(columns: ["_measurement", "_value"])
         '''
         
         print("📊 February 2025 record counts:")
-        result = query_api.query(count_query)
         total_records = 0
-        for table in result:
-            for record in table.records:
-                count = record.get_value()
-                print(f"  {record.get_measurement()}: {count} records")
-                total_records += count
+        for record in query_api.query_stream(count_query):
+            count = record.get_value()
+            print(f"  {record.get_measurement()}: {count} records")
+            total_records += count
         
         print(f"\n📈 Total records in February 2025: {total_records}")
         
-        # Get sample recent data from February
+        # Get sample recent data from February; series come back in time order, so
+        # tail() takes each one's latest rows and only those few are sorted
         sample_query = f'''
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: 2025-02-01T00:00:00Z, stop: 2025-02-28T23:59:59Z)
+        |> tail(n: 5)
         |> sort(columns: ["_time"], desc: true)
-        |> limit(n: 5)
+        |> keep(columns: ["_time", "_measurement", "_field", "_value"])
         '''
         
         print("\n📋 Most recent February 2025 records:")
-        result = query_api.query(sample_query)
-        for table in result:
-            for record in table.records:
-                timestamp = record.get_time().strftime('%Y-%m-%d %H:%M:%S')
-                measurement = record.get_measurement()
-                field = record.get_field()
-                value = record.get_value()
-                print(f"  {timestamp} | {measurement} | {field}: {value}")
+        # Records are printed as they arrive rather than after the whole result is built
+        for record in query_api.query_stream(sample_query):
+            timestamp = record.get_time().strftime('%Y-%m-%d %H:%M:%S')
+            measurement = record.get_measurement()
+            field = record.get_field()
+            value = record.get_value()
+            print(f"  {timestamp} | {measurement} | {field}: {value}")
                 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -23,16 +23,17 @@ def main():
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: 2025-03-01T00:00:00Z, stop: 2025-03-31T23:59:59Z)
         |> count()
+        |> group(columns: ["_measurement"])
+        |> sum()
+        |> keep(columns: ["_measurement", "_value"])
         '''
         
         print("📊 March 2025 record counts:")
-        result = query_api.query(count_query)
         total_records = 0
-        for table in result:
-            for record in table.records:
-                count = record.get_value()
-                print(f"  {record.get_measurement()}: {count} records")
-                total_records += count
+        for record in query_api.query_stream(count_query):
+            count = record.get_value()
+            print(f"  {record.get_measurement()}: {count} records")
+            total_records += count
         
         print(f"\n📈 Total records in March 2025: {total_records}")
         
@@ -41,17 +42,17 @@ def main():
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: 2025-03-01T00:00:00Z, stop: 2025-03-31T23:59:59Z)
         |> limit(n: 10)
+        |> keep(columns: ["_time", "_measurement", "_field", "_value"])
         '''
         
         print("\n📋 Sample March 2025 records:")
-        result = query_api.query(sample_query)
-        for table in result:
-            for record in table.records:
-                timestamp = record.get_time().strftime('%Y-%m-%d %H:%M:%S')
-                measurement = record.get_measurement()
-                field = record.get_field()
-                value = record.get_value()
-                print(f"  {timestamp} | {measurement} | {field}: {value}")
+        # Records are printed as they arrive rather than after the whole result is built
+        for record in query_api.query_stream(sample_query):
+            timestamp = record.get_time().strftime('%Y-%m-%d %H:%M:%S')
+            measurement = record.get_measurement()
+            field = record.get_field()
+            value = record.get_value()
+            print(f"  {timestamp} | {measurement} | {field}: {value}")
                 
     except Exception as e:
         print(f"❌ Error: {e}")
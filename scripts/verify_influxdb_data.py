@@ -23,6 +23,9 @@ def main():
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: -1h)
         |> count()
+        |> group(columns: ["_measurement"])
+        |> sum()
+        |> keep(columns: ["_measurement", "_value"])
         '''
         
         print("\n📊 Total records in last hour:")
@@ -36,6 +39,7 @@ def main():
         from(bucket: "{INFLUXDB_BUCKET}")
         |> range(start: -10m)
         |> limit(n: 5)
+        |> keep(columns: ["_time", "_measurement", "_field", "_value"])
         '''
         
         print("\n📋 Sample records (last 10 minutes):")